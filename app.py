@@ -1,13 +1,20 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
-from openai import OpenAI
 import os
 from dotenv import load_dotenv
-from io import StringIO
+from io import StringIO, BytesIO
 import uuid
-import requests
 import traceback
+import hashlib
+import threading
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import random
+import time
 
 # Load environment variables FIRST - before importing modules that need them
 load_dotenv()
@@ -35,6 +42,35 @@ except Exception as e:
             pass
     analytics = DummyAnalytics()
 
+ANALYTICS_QUEUE_MAXSIZE = 1024
+
+# Analytics writes happen on a background thread so logging I/O never delays the
+# rerun. cache_resource keeps a single queue + worker per process across reruns.
+@st.cache_resource
+def get_analytics_queue():
+    """Get the process-wide analytics queue, starting its worker thread once"""
+    log_queue = queue.Queue(maxsize=ANALYTICS_QUEUE_MAXSIZE)
+
+    def drain():
+        while True:
+            log_name, kwargs = log_queue.get()
+            try:
+                getattr(analytics, log_name)(**kwargs)
+            except Exception as e:
+                print(f"Analytics logging failed ({log_name}): {e}")
+            finally:
+                log_queue.task_done()
+
+    threading.Thread(target=drain, name="analytics-logger", daemon=True).start()
+    return log_queue
+
+def log_analytics(log_name, **kwargs):
+    """Queue an analytics.<log_name>(**kwargs) call; dropped if the queue is full"""
+    try:
+        get_analytics_queue().put_nowait((log_name, kwargs))
+    except queue.Full:
+        pass
+
 # Import authentication module (needs env vars to be loaded)
 import auth
 
@@ -69,39 +105,60 @@ import feedback
 # Import profile module
 import user_profile
 
-# Phase 3B: Import new hybrid search system
-try:
-    from search_integration import (
-        initialize_search_for_user,
-        smart_search,
-        migrate_to_new_search,
-        get_search_summary
-    )
-    HAS_NEW_SEARCH = True
-    print("✅ Phase 3B hybrid search loaded")
-except ImportError as e:
-    HAS_NEW_SEARCH = False
-    print(f"⚠️  New search system not available: {e}")
+# Phase 3B: New hybrid search system - imported on first use because it pulls in
+# sentence-transformers/FAISS, which would otherwise slow down every cold start
+# (including the login page, which never searches)
+@st.cache_resource
+def load_search_integration():
+    """Import the hybrid search module once; returns the module or None if unavailable"""
+    try:
+        import search_integration
+        print("✅ Phase 3B hybrid search loaded")
+        return search_integration
+    except ImportError as e:
+        print(f"⚠️  New search system not available: {e}")
+        return None
 
-# Phase 4: Import AI search agent (NEW - rebuilt from scratch)
+# Phase 4: AI search agent (NEW - rebuilt from scratch) - also imported on first use,
+# since only sessions that search (or upload) ever need it
+@st.cache_resource
+def load_ai_search_agent():
+    """Import the AI search agent once; returns create_ai_search_agent or None if unavailable"""
+    try:
+        from services.ai_search_agent import create_ai_search_agent
+        print("✅ AI Search Agent loaded (GPT-4 powered)")
+        return create_ai_search_agent
+    except ImportError as e:
+        print(f"⚠️  AI Search Agent not available: {e}")
+        return None
+
+# Optional: Arrow-backed string columns for uploaded contacts (smaller, faster .str ops)
 try:
-    from services.ai_search_agent import create_ai_search_agent
-    HAS_AI_AGENT = True
-    print("✅ AI Search Agent loaded (GPT-4 powered)")
-except ImportError as e:
-    HAS_AI_AGENT = False
-    print(f"⚠️  AI Search Agent not available: {e}")
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Whitespace that sneaks into keys pasted into TOML secrets / .env files
+_KEY_WHITESPACE = str.maketrans('', '', ' \n\r\t')
 
 # Initialize OpenAI client - works both locally and on Streamlit Cloud
-def get_openai_api_key():
-    """Get OpenAI API key from Streamlit secrets or environment variable"""
+@st.cache_resource(show_spinner=False)
+def _resolve_openai_api_key():
+    """
+    Look up and sanitize the OpenAI API key once per process
+
+    Cached with st.cache_resource rather than functools.lru_cache: this script is
+    re-executed on every rerun, which would hand lru_cache a fresh, empty cache each time.
+    Raises RuntimeError if no usable key is configured (exceptions aren't cached, so a key
+    added later is picked up on the next call).
+    """
     # Try Streamlit Cloud secrets first
     try:
         if 'OPENAI_API_KEY' in st.secrets:
-            key = st.secrets["OPENAI_API_KEY"]
             # CRITICAL: Strip whitespace and newlines that may be in TOML secrets
-            key = key.strip().replace('\n', '').replace('\r', '').replace(' ', '')
-            if key and len(key) > 20:  # Basic validation
+            key = st.secrets["OPENAI_API_KEY"].translate(_KEY_WHITESPACE)
+            if len(key) > 20:  # Basic validation
                 return key
     except Exception:
         pass
@@ -110,34 +167,119 @@ def get_openai_api_key():
     api_key = os.getenv("OPENAI_API_KEY")
     if api_key:
         # Also strip for consistency
-        api_key = api_key.strip().replace('\n', '').replace('\r', '').replace(' ', '')
+        api_key = api_key.translate(_KEY_WHITESPACE)
         if len(api_key) > 20:
             return api_key
 
-    st.error("OpenAI API key not found! Please check Streamlit Cloud secrets.")
-    st.stop()
-    return None
+    raise RuntimeError("OpenAI API key not found")
 
-# Initialize client lazily to avoid startup errors
-client = None
+def get_openai_api_key():
+    """Get OpenAI API key from Streamlit secrets or environment variable (resolved once per process)"""
+    try:
+        return _resolve_openai_api_key()
+    except RuntimeError:
+        st.error("OpenAI API key not found! Please check Streamlit Cloud secrets.")
+        st.stop()
+        return None
+
+# Connection pool for the OpenAI client: sized for the app's background OpenAI calls with
+# headroom, but kept modest so idle sockets don't pile up on Streamlit Cloud's FD limits
+OPENAI_POOL_LIMITS = dict(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+
+@st.cache_resource(show_spinner=False)
+def _build_openai_client(api_key):
+    """
+    Build the process-wide OpenAI client on a tuned, persistent httpx pool
+
+    Cached with st.cache_resource (keyed by API key) so one client and its warm
+    keep-alive connections are reused across reruns and sessions; the module-level
+    global this replaces was reset on every rerun.
+    """
+    import openai
+
+    # DefaultHttpxClient keeps the SDK's own client defaults and is built on whichever
+    # HTTP library the installed openai uses (httpx or httpx2), so neither is imported
+    # directly; Limits comes from the type of the SDK's default limits for the same reason
+    limits_cls = type(openai.DEFAULT_CONNECTION_LIMITS)
+    http_client = openai.DefaultHttpxClient(
+        limits=limits_cls(**OPENAI_POOL_LIMITS),
+        timeout=openai.Timeout(30.0, connect=5.0)
+    )
+    return openai.OpenAI(
+        api_key=api_key,
+        http_client=http_client,
+        max_retries=2
+    )
 
 def get_client():
     """Get or create OpenAI client"""
-    global client
-    if client is None:
+    api_key = get_openai_api_key()
+    try:
+        return _build_openai_client(api_key)
+    except Exception as e:
+        st.error(f"Failed to initialize OpenAI client: {str(e)}")
+        st.stop()
+
+# openai and requests are imported where they're first used, not at the top of the
+# file: together they add a noticeable chunk to cold start, and the login page and
+# first paint need neither (Python caches the import after the first call)
+
+def retryable_openai_errors():
+    """Transient OpenAI failures worth retrying (rate limits, timeouts, dropped connections, 5xx)"""
+    from openai import RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
+    return (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 529}
+
+def call_with_backoff(func, *args, retry_on=None, retry_if=None,
+                      max_attempts=5, base_delay=1.0, max_delay=30.0, **kwargs):
+    """
+    Call func, retrying transient failures with exponential backoff and full jitter
+
+    Each retry sleeps a random time in [0, min(max_delay, base_delay * 2**attempt)],
+    which spreads retries out when many sessions get rate limited at once.
+
+    Args:
+        func: Callable to invoke with *args/**kwargs
+        retry_on: Exception types that should be retried (default: retryable_openai_errors())
+        retry_if: Optional predicate on the result - return True to retry (e.g. HTTP 429)
+        max_attempts: Total attempts before giving up (last error/result is returned or raised)
+
+    Returns:
+        Whatever func returns
+    """
+    if retry_on is None:
+        retry_on = retryable_openai_errors()
+
+    for attempt in range(max_attempts):
+        last_attempt = attempt == max_attempts - 1
         try:
-            client = OpenAI(
-                api_key=get_openai_api_key(),
-                timeout=30.0,
-                max_retries=2
-            )
-        except Exception as e:
-            st.error(f"Failed to initialize OpenAI client: {str(e)}")
-            st.stop()
-    return client
+            result = func(*args, **kwargs)
+        except retry_on:
+            if last_attempt:
+                raise
+        else:
+            if retry_if is None or last_attempt or not retry_if(result):
+                return result
+        time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+
+# Shared HTTP session so repeated diagnostic calls reuse the keep-alive TLS
+# connection to api.openai.com instead of handshaking on every request.
+# cache_resource keeps it alive across reruns (module globals are rebuilt on every rerun).
+@st.cache_resource
+def get_http_session():
+    """Get the process-wide pooled requests session"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    return session
 
 def run_diagnostic_test():
     """Run comprehensive diagnostic tests to identify connection issues"""
+    import requests
+
     api_key = get_openai_api_key()
 
     results = {
@@ -169,11 +311,14 @@ def run_diagnostic_test():
             "max_tokens": 10
         }
 
-        response = requests.post(
+        response = call_with_backoff(
+            get_http_session().post,
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=payload,
-            timeout=30
+            timeout=30,
+            retry_on=(requests.exceptions.ConnectionError,),
+            retry_if=lambda r: r.status_code in RETRYABLE_STATUS_CODES
         )
 
         results["direct_http_test"]["status_code"] = response.status_code
@@ -197,11 +342,11 @@ def run_diagnostic_test():
         results["direct_http_test"]["details"] = f"{type(e).__name__}: {str(e)[:200]}"
         results["direct_http_test"]["traceback"] = traceback.format_exc()[:500]
 
-    # Test 3: OpenAI SDK test
+    # Test 3: OpenAI SDK test (uses the app's shared client and its connection pool)
     try:
-        test_client = OpenAI(api_key=api_key, timeout=30.0, max_retries=0)
-
-        response = test_client.chat.completions.create(
+        # SDK retries are disabled here so they don't stack with call_with_backoff
+        response = call_with_backoff(
+            get_client().with_options(max_retries=0).chat.completions.create,
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": "Say 'test successful' in 2 words"}],
             max_tokens=10
@@ -233,1145 +378,165 @@ st.set_page_config(
     initial_sidebar_state="auto"  # Auto-expand on desktop, collapsed on mobile
 )
 
-# Flow-inspired refined CSS styling - clean, minimal, professional
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=Crimson+Pro:wght@400;600;700&display=swap');
-
-    :root {
-        /* Wispr Flow inspired color palette - warm neutrals + subtle green */
-        /* Primary brand color - subtle green (Wispr Flow style) */
-        --primary: #16a34a;
-        --primary-hover: #15803d;
-        --primary-light: #dcfce7;
-        --primary-glow: rgba(34, 197, 94, 0.15);
-
-        /* Soft neutral backgrounds (warm, not clinical) */
-        --bg-primary: #fafaf9;
-        --bg-secondary: #ffffff;
-        --bg-tertiary: #f5f5f4;
-        --bg-hover: #f9fafb;
-
-        /* Text hierarchy - AA contrast compliant */
-        --text-primary: #1c1917;    /* Warmer near-black */
-        --text-secondary: #57534e;  /* Warmer gray */
-        --text-tertiary: #a8a29e;   /* Muted warm gray */
-
-        /* Borders - subtle warm tones */
-        --border-subtle: #e7e5e4;
-        --border-medium: #d6d3d1;
-        --border-light: #f5f5f4;
-
-        /* Feedback colors - harmonious palette */
-        --success: #16a34a;
-        --error: #dc2626;
-        --warning: #ea580c;
-
-        /* Spacing scale */
-        --space-1: 0.25rem;
-        --space-2: 0.5rem;
-        --space-3: 0.75rem;
-        --space-4: 1rem;
-        --space-6: 1.5rem;
-        --space-8: 2rem;
-        --space-12: 3rem;
-        --space-16: 4rem;
-        --space-24: 6rem;
-
-        /* Border radius - 12-16px range */
-        --radius-sm: 0.5rem;
-        --radius-md: 0.75rem;
-        --radius-lg: 1rem;
-        --radius-pill: 9999px;
-
-        /* Refined shadows - subtle and consistent */
-        --shadow-sm: 0 1px 2px rgba(0, 0, 0, 0.04);
-        --shadow-md: 0 2px 8px rgba(0, 0, 0, 0.06);
-        --shadow-lg: 0 4px 16px rgba(0, 0, 0, 0.08);
-
-        /* Typography */
-        --font-serif: 'Crimson Pro', Georgia, serif;
-        --font-sans: 'Inter', system-ui, -apple-system, sans-serif;
-    }
-
-    * {
-        font-family: var(--font-sans);
-    }
-
-    /* Sidebar styling - Flow aesthetic */
-    section[data-testid="stSidebar"] {
-        background: var(--bg-secondary);
-        border-right: 1px solid var(--border-subtle);
-    }
-
-    section[data-testid="stSidebar"] > div {
-        background: var(--bg-secondary);
-    }
-
-    /* Main background - soft neutral */
-    .main {
-        background: var(--bg-primary);
-        padding-top: 0 !important;
-    }
-
-    /* Content container - centered, spacious */
-    .block-container {
-        padding-top: 5rem !important;
-        padding-bottom: var(--space-16);
-        max-width: 1140px;
-        margin: 0 auto;
-    }
-
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-
-    /* Hero typography - Serif/Sans pairing */
-    .hero-title {
-        font-family: var(--font-serif);
-        font-size: 4rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        letter-spacing: -0.02em;
-        line-height: 1.1;
-        margin-bottom: var(--space-4);
-    }
-
-    .hero-subtitle {
-        font-family: var(--font-sans);
-        font-size: 1.125rem;
-        font-weight: 400;
-        color: var(--text-secondary);
-        line-height: 1.5;
-        margin-bottom: var(--space-8);
-    }
-
-    /* Typography hierarchy */
-    h1 {
-        font-family: var(--font-serif);
-        font-size: 2.5rem !important;
-        font-weight: 600 !important;
-        color: var(--text-primary) !important;
-        letter-spacing: -0.02em;
-        line-height: 1.2 !important;
-    }
-
-    h2, h3 {
-        font-family: var(--font-sans);
-        font-weight: 600 !important;
-        color: var(--text-primary) !important;
-        letter-spacing: -0.01em !important;
-    }
-
-    /* Search input - Clean and minimal */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea {
-        border-radius: var(--radius-md);
-        border: 1px solid var(--border-subtle);
-        background: var(--bg-secondary);
-        padding: 0.875rem 1.25rem;
-        font-size: 0.9375rem;
-        transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1);
-        color: var(--text-primary);
-        box-shadow: var(--shadow-sm);
-        font-family: var(--font-sans);
-    }
-
-    /* Main search input - Make it PROMINENT (Happenstance style) */
-    #unified_search_query {
-        font-size: 1.125rem !important;
-        padding: 1.125rem 1.5rem !important;
-        border-radius: var(--radius-lg) !important;
-        border: 2px solid var(--border-medium) !important;
-        box-shadow: var(--shadow-md) !important;
-        transition: all 0.25s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-
-    #unified_search_query:hover {
-        border-color: var(--border-medium) !important;
-        box-shadow: var(--shadow-lg) !important;
-    }
-
-    #unified_search_query:focus {
-        outline: none !important;
-        border-color: var(--primary) !important;
-        box-shadow: 0 0 0 4px var(--primary-glow), var(--shadow-lg) !important;
-        transform: scale(1.01) !important;
-    }
-
-    .stTextInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus {
-        outline: none;
-        border-color: var(--primary);
-        box-shadow: 0 0 0 3px var(--primary-glow), var(--shadow-md);
-    }
-
-    .stTextInput > div > div > input::placeholder,
-    .stTextArea > div > div > textarea::placeholder {
-        color: var(--text-tertiary);
-    }
-
-    #unified_search_query::placeholder {
-        color: var(--text-tertiary) !important;
-        font-weight: 400 !important;
-    }
-
-    /* Select boxes - Notion style */
-    .stSelectbox > div > div {
-        border-radius: var(--radius-md);
-        border: 1px solid var(--border-subtle);
-        transition: all 0.2s ease;
-    }
-
-    .stSelectbox > div > div:hover {
-        border-color: var(--border-medium);
-    }
-
-    .stSelectbox > div > div:focus-within {
-        border-color: var(--primary);
-        box-shadow: 0 0 0 3px var(--primary-glow);
-    }
-
-    /* Multiselect - Clean */
-    .stMultiSelect > div > div {
-        border-radius: var(--radius-md);
-        border: 1px solid var(--border-subtle);
-        background: var(--bg-secondary);
-    }
-
-    .stMultiSelect > div > div:focus-within {
-        border-color: var(--primary);
-        box-shadow: 0 0 0 3px var(--primary-glow);
-    }
-
-    /* Checkboxes - Notion style */
-    .stCheckbox {
-        padding: 0.25rem 0;
-    }
-
-    .stCheckbox > label {
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        cursor: pointer;
-        user-select: none;
-    }
-
-    .stCheckbox > label > div:first-child {
-        flex-shrink: 0;
-    }
-
-    /* Radio buttons - Clean */
-    .stRadio > div {
-        gap: 0.5rem;
-    }
-
-    .stRadio > div > label {
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        padding: 0.5rem;
-        border-radius: var(--radius-sm);
-        transition: background 0.15s ease;
-        cursor: pointer;
-    }
-
-    .stRadio > div > label:hover {
-        background: var(--bg-tertiary);
-    }
-
-    /* ============================================
-       STANDARDIZED BUTTON STYLES - SaaS Modern
-       ============================================ */
-
-    /* Base button styling - All buttons */
-    .stButton > button,
-    .stFormSubmitButton > button {
-        /* Shape: Rectangular with moderate corner radius */
-        border-radius: 10px !important;
-
-        /* Sizing: Minimum width to prevent text wrapping */
-        min-width: 120px !important;
-        padding: 0.75rem 1.5rem !important;
-
-        /* Typography: 16px semibold */
-        font-size: 16px !important;
-        font-weight: 600 !important;
-        line-height: 1.5 !important;
-
-        /* Spacing: Prevent text wrapping */
-        white-space: nowrap !important;
-
-        /* Transitions: Smooth 150ms */
-        transition: all 0.15s ease !important;
-
-        /* Cursor */
-        cursor: pointer !important;
-
-        /* Remove transforms to avoid bubbly feel */
-        transform: none !important;
-    }
-
-    /* Primary button (type="primary" or default) */
-    .stButton > button[kind="primary"],
-    .stButton > button[data-testid*="primary"],
-    .stFormSubmitButton > button,
-    .stButton > button:not([kind="secondary"]):not([kind="tertiary"]) {
-        background: var(--primary) !important;
-        color: white !important;
-        border: 2px solid var(--primary) !important;
-        box-shadow: var(--shadow-sm) !important;
-    }
-
-    .stButton > button[kind="primary"]:hover,
-    .stButton > button[data-testid*="primary"]:hover,
-    .stFormSubmitButton > button:hover,
-    .stButton > button:not([kind="secondary"]):not([kind="tertiary"]):hover {
-        background: var(--primary-hover) !important;
-        border-color: var(--primary-hover) !important;
-        box-shadow: var(--shadow-md) !important;
-        /* No transform - keep it flat */
-    }
-
-    /* Secondary button (type="secondary") */
-    .stButton > button[kind="secondary"],
-    .stButton > button[data-testid*="secondary"] {
-        background: white !important;
-        color: var(--primary) !important;
-        border: 2px solid var(--primary) !important;
-        box-shadow: var(--shadow-sm) !important;
-    }
-
-    .stButton > button[kind="secondary"]:hover,
-    .stButton > button[data-testid*="secondary"]:hover {
-        background: var(--primary-light) !important;
-        border-color: var(--primary-hover) !important;
-        color: var(--primary-hover) !important;
-        box-shadow: var(--shadow-md) !important;
-        /* No transform - keep it flat */
-    }
-
-    /* Active/pressed state - subtle feedback */
-    .stButton > button:active,
-    .stFormSubmitButton > button:active {
-        box-shadow: inset 0 2px 4px rgba(0, 0, 0, 0.1) !important;
-        transform: none !important;
-    }
-
-    /* Disabled state */
-    .stButton > button:disabled,
-    .stFormSubmitButton > button:disabled {
-        opacity: 0.5 !important;
-        cursor: not-allowed !important;
-    }
-
-    /* Button spacing - Consistent gaps between buttons */
-    .stButton {
-        margin: 0 !important;
-    }
-
-    /* Horizontal button groups - even spacing */
-    [data-testid="column"] .stButton {
-        margin: 0 6px !important;
-    }
-
-    [data-testid="column"]:first-child .stButton {
-        margin-left: 0 !important;
-    }
-
-    [data-testid="column"]:last-child .stButton {
-        margin-right: 0 !important;
-    }
-
-    /* File uploader - Premium card */
-    .stFileUploader {
-        background: var(--bg-secondary);
-        border-radius: var(--radius-lg);
-        padding: var(--space-8);
-        border: 1px solid var(--border-light);
-        transition: all 0.15s ease;
-        box-shadow: var(--shadow-sm);
-    }
-
-    .stFileUploader:hover {
-        border-color: var(--primary);
-        background: var(--bg-secondary);
-        box-shadow: var(--shadow-md);
-    }
-
-    /* Dataframe styling - Clean card */
-    .stDataFrame {
-        border-radius: var(--radius-md);
-        overflow: hidden;
-        border: 1px solid var(--border-subtle);
-        box-shadow: var(--shadow-sm);
-        background: var(--bg-secondary);
-    }
-
-    /* Success/Info boxes - Clean alerts */
-    .stSuccess {
-        background: rgba(16, 185, 129, 0.05);
-        border: 1px solid var(--success);
-        border-radius: var(--radius-md);
-        padding: var(--space-4);
-        color: var(--success);
-        box-shadow: var(--shadow-sm);
-        font-weight: 500;
-    }
-
-    .stInfo {
-        background: rgba(37, 99, 235, 0.05);
-        border: 1px solid var(--primary);
-        border-radius: var(--radius-md);
-        padding: var(--space-4);
-        color: var(--primary);
-        box-shadow: var(--shadow-sm);
-        font-weight: 500;
-    }
-
-    .stWarning {
-        background: rgba(234, 88, 12, 0.05);
-        border: 1px solid var(--warning);
-        border-radius: var(--radius-md);
-        padding: var(--space-4);
-        color: var(--warning);
-        box-shadow: var(--shadow-sm);
-        font-weight: 500;
-    }
-
-    .stError {
-        background: rgba(220, 38, 38, 0.05);
-        border: 1px solid var(--error);
-        border-radius: var(--radius-md);
-        padding: var(--space-4);
-        color: var(--error);
-        box-shadow: var(--shadow-sm);
-        font-weight: 500;
-    }
-
-    /* Expander styling - Clean card */
-    .streamlit-expanderHeader {
-        background: var(--bg-secondary);
-        border-radius: var(--radius-md);
-        font-weight: 600;
-        color: var(--text-primary);
-        border: 1px solid var(--border-subtle);
-        transition: all 0.15s ease;
-        box-shadow: var(--shadow-sm);
-    }
-
-    .streamlit-expanderHeader:hover {
-        border-color: var(--border-medium);
-        background: var(--bg-tertiary);
-        box-shadow: var(--shadow-md);
-    }
-
-    /* Results summary - Clean card */
-    .results-summary {
-        background: var(--bg-secondary);
-        padding: var(--space-8);
-        border-radius: var(--radius-md);
-        border: 1px solid var(--border-subtle);
-        margin: var(--space-6) 0;
-        box-shadow: var(--shadow-sm);
-        transition: all 0.15s ease;
-    }
-
-    .results-summary:hover {
-        box-shadow: var(--shadow-md);
-        border-color: var(--border-medium);
-    }
-
-    .results-summary strong {
-        font-size: 1.125rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        display: block;
-        margin-bottom: 0.5rem;
-    }
-
-    .results-summary-meta {
-        color: var(--text-secondary);
-        font-size: 0.9375rem;
-        line-height: 1.6;
-    }
-
-    /* Download buttons - Standardized secondary style */
-    .stDownloadButton > button {
-        background: white !important;
-        color: var(--primary) !important;
-        border: 2px solid var(--primary) !important;
-        border-radius: 10px !important;
-        padding: 0.75rem 1.5rem !important;
-        font-size: 16px !important;
-        font-weight: 600 !important;
-        min-width: 120px !important;
-        white-space: nowrap !important;
-        transition: all 0.15s ease !important;
-        box-shadow: var(--shadow-sm) !important;
-    }
-
-    .stDownloadButton > button:hover {
-        background: var(--primary-light) !important;
-        color: var(--primary-hover) !important;
-        border-color: var(--primary-hover) !important;
-        box-shadow: var(--shadow-md) !important;
-    }
-
-    /* Hide default Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    /* Section headers - Clean */
-    h2 {
-        font-size: 1.75rem !important;
-        margin-bottom: var(--space-6) !important;
-    }
-
-    h3 {
-        font-size: 1.25rem !important;
-        margin-bottom: var(--space-4) !important;
-    }
-
-    /* Markdown text */
-    .main .stMarkdown {
-        color: var(--text-secondary);
-        line-height: 1.7;
-    }
-
-    /* Dividers - Clean */
-    hr {
-        border: none;
-        height: 1px;
-        background: var(--border-subtle);
-        margin: var(--space-8) 0;
-    }
-
-    /* Section spacing - Generous whitespace */
-    .section-spacing {
-        margin-top: var(--space-12);
-        margin-bottom: var(--space-12);
-    }
-
-    .section-header {
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        margin-bottom: var(--space-6);
-        letter-spacing: -0.01em;
-    }
-
-    /* Pagination controls - Notion style */
-    .pagination-button {
-        min-width: 40px !important;
-        height: 40px !important;
-        padding: 0.5rem !important;
-        display: inline-flex !important;
-        align-items: center !important;
-        justify-content: center !important;
-    }
-
-    .pagination-current {
-        background: var(--primary) !important;
-        color: white !important;
-        font-weight: 600;
-        padding: 0.5rem 1rem;
-        border-radius: var(--radius-sm);
-        display: inline-block;
-        text-align: center;
-    }
-
-    /* Upload card - Premium styling */
-    .upload-section {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border-subtle);
-        border-radius: var(--radius-lg);
-        padding: var(--space-8);
-        margin: var(--space-8) 0;
-        box-shadow: var(--shadow-sm);
-        transition: all 0.2s ease;
-    }
-
-    .upload-section:hover {
-        border-color: var(--primary);
-        box-shadow: var(--shadow-md);
-    }
-
-    .upload-header {
-        font-size: 1.25rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        margin-bottom: var(--space-4);
-        text-align: center;
-    }
-
-    .upload-subtitle {
-        color: var(--text-secondary);
-        font-size: 0.9375rem;
-        text-align: center;
-        margin-bottom: var(--space-6);
-    }
-
-    /* Card component */
-    .card {
-        background: var(--bg-secondary);
-        border-radius: var(--radius-md);
-        padding: var(--space-6);
-        box-shadow: var(--shadow-sm);
-        border: 1px solid var(--border-subtle);
-        transition: all 0.15s ease;
-    }
-
-    .card:hover {
-        box-shadow: var(--shadow-md);
-    }
-
-    /* ============================================
-       NOTION-INSPIRED CONTACT CARDS
-       ============================================ */
-
-    .contact-card {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border-subtle);
-        border-radius: var(--radius-lg);
-        padding: var(--space-6);
-        margin-bottom: var(--space-4);
-        transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: var(--shadow-sm);
-        position: relative;
-        cursor: pointer;
-    }
-
-    .contact-card:hover {
-        border-color: var(--primary);
-        box-shadow: 0 4px 16px rgba(22, 163, 74, 0.12), var(--shadow-md);
-        transform: translateY(-4px);
-    }
-
-    .contact-avatar {
-        width: 48px;
-        height: 48px;
-        border-radius: var(--radius-lg);
-        background: linear-gradient(135deg, var(--primary) 0%, var(--primary-hover) 100%);
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        color: white;
-        font-weight: 600;
-        font-size: 1.25rem;
-        flex-shrink: 0;
-        box-shadow: 0 2px 4px rgba(22, 163, 74, 0.2);
-    }
-
-    .contact-name {
-        font-weight: 600;
-        font-size: 1rem;
-        color: var(--text-primary);
-        margin-bottom: 0.25rem;
-        line-height: 1.4;
-    }
-
-    .contact-position {
-        color: var(--text-secondary);
-        font-size: 0.9375rem;
-        margin-bottom: 0.25rem;
-        line-height: 1.5;
-    }
-
-    .contact-company {
-        color: var(--text-tertiary);
-        font-size: 0.875rem;
-        display: flex;
-        align-items: center;
-        gap: 0.375rem;
-    }
-
-    .contact-email {
-        color: var(--primary);
-        font-size: 0.8125rem;
-        font-weight: 500;
-        display: inline-flex;
-        align-items: center;
-        gap: 0.25rem;
-        margin-top: 0.5rem;
-        padding: 0.25rem 0.5rem;
-        background: var(--primary-light);
-        border-radius: var(--radius-sm);
-    }
-
-    .contact-info-row {
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        flex-wrap: wrap;
-        margin-top: 0.5rem;
-    }
-
-    /* Extended network contact card - harmonized with new green palette */
-    .extended-contact-card {
-        background: #f0fdf4;
-        border: 1px solid #bbf7d0;
-        border-left: 4px solid var(--primary);
-        border-radius: var(--radius-lg);
-        padding: var(--space-6);
-        margin-bottom: var(--space-4);
-        transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: var(--shadow-sm);
-    }
-
-    .extended-contact-card:hover {
-        border-left-color: var(--primary-hover);
-        box-shadow: 0 4px 16px rgba(22, 163, 74, 0.12), var(--shadow-md);
-        transform: translateY(-4px);
-    }
-
-    .extended-badge {
-        background: white;
-        padding: 0.375rem 0.75rem;
-        border-radius: var(--radius-sm);
-        color: var(--primary-hover);
-        font-size: 0.8125rem;
-        font-weight: 600;
-        display: inline-block;
-        margin-top: 0.75rem;
-        box-shadow: var(--shadow-sm);
-    }
-
-    /* Match score badge - Happenstance style */
-    .match-score {
-        display: inline-flex;
-        align-items: center;
-        padding: 0.25rem 0.625rem;
-        background: var(--primary-light);
-        color: var(--primary-hover);
-        font-size: 0.75rem;
-        font-weight: 600;
-        border-radius: var(--radius-pill);
-        margin-left: 0.5rem;
-    }
-
-    /* Match explanation - transparent AI */
-    .match-explanation {
-        margin-top: var(--space-3);
-        padding: var(--space-3);
-        background: var(--bg-tertiary);
-        border-radius: var(--radius-sm);
-        border-left: 3px solid var(--primary-light);
-    }
-
-    .match-explanation-title {
-        font-size: 0.75rem;
-        font-weight: 600;
-        color: var(--text-secondary);
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-        margin-bottom: var(--space-2);
-    }
-
-    .match-reason {
-        font-size: 0.875rem;
-        color: var(--text-secondary);
-        line-height: 1.5;
-        display: flex;
-        align-items: flex-start;
-        gap: 0.5rem;
-        margin-bottom: 0.25rem;
-    }
-
-    .match-reason-icon {
-        color: var(--primary);
-        flex-shrink: 0;
-        margin-top: 0.125rem;
-    }
-
-    /* Top navigation bar */
-    .top-nav {
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 64px;
-        background: var(--bg-secondary);
-        border-bottom: 1px solid var(--border-subtle);
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        padding: 0 var(--space-8);
-        z-index: 1000;
-        box-shadow: var(--shadow-sm);
-    }
-
-    .header-title {
-        font-family: var(--font-serif);
-        font-size: 1.5rem !important;
-        font-weight: 700 !important;
-        color: var(--text-primary) !important;
-        text-decoration: none;
-        line-height: 2.5rem !important;
-        margin: 0 !important;
-        letter-spacing: -0.01em;
-    }
-
-    .top-nav-logo {
-        font-family: var(--font-serif);
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: var(--text-primary);
-        text-decoration: none;
-    }
-
-    .top-nav-links {
-        display: flex;
-        gap: var(--space-8);
-        align-items: center;
-    }
-
-    .top-nav-link {
-        font-size: 0.9375rem;
-        font-weight: 500;
-        color: var(--text-secondary);
-        text-decoration: none;
-        transition: color 0.15s ease;
-    }
-
-    .top-nav-link:hover {
-        color: var(--text-primary);
-    }
-
-    /* Select contacts header */
-    .select-header {
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        margin-bottom: var(--space-6);
-        padding: var(--space-4);
-        background: var(--bg-tertiary);
-        border-radius: var(--radius-md);
-    }
-
-    .select-header h3 {
-        margin: 0 !important;
-        font-size: 1.25rem !important;
-        font-weight: 600;
-        color: var(--text-primary);
-    }
-
-    .page-info {
-        color: var(--text-secondary);
-        font-size: 0.9375rem;
-        font-weight: 500;
-    }
-
-    .top-nav-cta {
-        background: var(--primary);
-        color: white;
-        border: 2px solid var(--primary);
-        border-radius: 10px;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        font-size: 16px;
-        min-width: 120px;
-        white-space: nowrap;
-        transition: all 0.15s ease;
-        box-shadow: var(--shadow-sm);
-        cursor: pointer;
-        text-decoration: none;
-        display: inline-flex;
-        align-items: center;
-        justify-content: center;
-        gap: 0.5rem;
-    }
-
-    .top-nav-cta:hover {
-        background: var(--primary-hover);
-        border-color: var(--primary-hover);
-        box-shadow: var(--shadow-md);
-    }
-
-    /* ============================================
-       MOBILE RESPONSIVE STYLES
-       ============================================ */
-
-    @media (max-width: 768px) {
-        .hero-title {
-            font-size: 2.5rem;
-        }
-
-        .hero-subtitle {
-            font-size: 1rem;
-        }
-
-        .block-container {
-            padding-top: 5rem !important;
-            padding-left: var(--space-4);
-            padding-right: var(--space-4);
-        }
-
-        .top-nav {
-            padding: 0 var(--space-4);
-        }
-
-        .top-nav-links {
-            gap: var(--space-4);
-        }
-
-        .top-nav-link {
-            display: none;
-        }
-
-        .stButton > button,
-        .stFormSubmitButton > button {
-            width: 100% !important;
-            padding: 0.875rem 1.5rem !important;
-            font-size: 16px !important;
-            min-width: auto !important;
-        }
-
-        .stTextInput > div > div > input {
-            width: 100%;
-            font-size: 16px !important;
-        }
-
-        h2, h3, h4 {
-            font-size: 1.4rem !important;
-        }
-
-        .stDataFrame {
-            font-size: 0.9rem;
-        }
-
-        .results-summary {
-            padding: var(--spacing-lg);
-            font-size: 0.95rem;
-        }
-
-        .stDownloadButton > button {
-            width: 100%;
-            margin-bottom: var(--spacing-sm);
-        }
-
-        .card {
-            padding: var(--spacing-lg);
-        }
-    }
-
-    @media (max-width: 480px) {
-        h1 {
-            font-size: 1.875rem !important;
-        }
-
-        .subtitle {
-            font-size: 0.95rem;
-        }
-
-        .block-container {
-            padding-left: var(--spacing-sm);
-            padding-right: var(--spacing-sm);
-        }
+@st.cache_resource(show_spinner=False)
+def prewarm_openai_connection():
+    """Open the OpenAI client's TLS connection to api.openai.com in the background, once per process"""
+    def warm():
+        try:
+            # Warms the same pooled client get_client() returns, so the first search or
+            # email reuses the connection; any failure just leaves the pool cold
+            _build_openai_client(_resolve_openai_api_key()).with_options(max_retries=0, timeout=5).models.list()
+        except Exception:
+            pass
 
-        .stButton > button,
-        .stFormSubmitButton > button {
-            padding: 0.875rem 1.25rem !important;
-            font-size: 16px !important;
-        }
-    }
+    threading.Thread(target=warm, daemon=True).start()
+    return True
 
-    @media (min-width: 769px) and (max-width: 1024px) {
-        h1 {
-            font-size: 2.75rem !important;
-        }
+prewarm_openai_connection()
 
-        .block-container {
-            max-width: 900px;
-        }
-    }
+# Flow-inspired refined CSS styling - clean, minimal, professional
+# The stylesheet lives in static/app.css and is read once per process, but it is still
+# emitted inline: a <link> to Streamlit's static file server doesn't work across our
+# supported versions, because the Tornado-based releases serve .css as nosniff text/plain
+# and browsers refuse to apply it.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+@st.cache_resource
+def load_static_css(filename):
+    """Read a stylesheet from static/ once per process and wrap it in a <style> tag"""
+    with open(os.path.join(STATIC_DIR, filename), encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
+
+# Note: the <style> must be emitted on every run - Streamlit removes elements that a
+# rerun doesn't re-render.
+st.markdown(load_static_css("app.css"), unsafe_allow_html=True)
+
+# Lower-nav alignment rules. Their selectors match any secondary button in a column,
+# so they are only sent while the lower nav renders instead of living in app.css
+_LOWER_NAV_CSS = """
+<style>
+/* Ensure active nav buttons also have proper height and alignment */
+div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
+    height: 40px !important;
+    display: inline-flex !important;
+    align-items: center !important;
+    justify-content: center !important;
+    line-height: 1 !important;
+}
 
-    /* ============================================
-       TAB STYLING - Clean tabs
-       ============================================ */
+/* Lower nav container - force vertical alignment for all columns */
+.lower-nav-container [data-testid="column"] {
+    display: flex !important;
+    align-items: center !important;
+    min-height: 40px !important;
+}
+</style>
+"""
 
-    .stTabs {
-        background: var(--bg-secondary);
-        border-radius: var(--radius-md);
-        padding: var(--space-2);
-        border: 1px solid var(--border-subtle);
-        box-shadow: var(--shadow-sm);
-    }
+# Dark mode overrides, built once at import and emitted by main() while dark mode is on
+_DARK_MODE_CSS = """
+<style>
+/* Dark Mode Overrides - Target ALL background elements */
+html, body, [data-testid="stAppViewContainer"], [data-testid="stApp"], .main, .stApp {
+    background-color: #0a0a0a !important;
+    background: #0a0a0a !important;
+}
 
-    .stTabs [data-baseweb="tab-list"] {
-        gap: var(--space-2);
-        background: var(--bg-tertiary);
-        padding: var(--space-2);
-        border-radius: var(--radius-md);
-    }
+/* Force block container background */
+.block-container {
+    background-color: #0a0a0a !important;
+}
 
-    .stTabs [data-baseweb="tab"] {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border-subtle);
-        border-radius: var(--radius-md);
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        color: var(--text-secondary);
-        font-size: 0.9375rem;
-        transition: all 0.15s ease;
-    }
+h1 {
+    color: #ffffff !important;
+}
 
-    .stTabs [data-baseweb="tab"]:hover {
-        background: var(--bg-secondary);
-        border-color: var(--border-medium);
-        color: var(--text-primary);
-    }
+.subtitle {
+    color: #b0b0b0 !important;
+}
 
-    .stTabs [aria-selected="true"] {
-        background: var(--primary) !important;
-        color: white !important;
-        border-color: var(--primary) !important;
-        box-shadow: var(--shadow-md) !important;
-    }
+h2, h3, h4 {
+    color: #e0e0e0 !important;
+}
 
-    .stTabs [data-baseweb="tab-panel"] {
-        padding: var(--spacing-xl) var(--spacing-sm);
-    }
+.main .stMarkdown, .stMarkdown p, .stMarkdown div {
+    color: #b0b0b0 !important;
+}
 
-    .stTabs button[role="tab"] {
-        color: var(--gray-700) !important;
-        font-weight: 600 !important;
-    }
+.stTextInput > div > div > input {
+    background: #1a1a1a !important;
+    color: #e0e0e0 !important;
+    border-color: #2a2a2a !important;
+}
 
-    .stTabs button[role="tab"][aria-selected="true"] {
-        color: white !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+.stTextInput > div > div > input:focus {
+    border-color: #4a4a4a !important;
+    box-shadow: 0 0 0 3px rgba(255, 255, 255, 0.05) !important;
+}
 
-# ============================================
-# UNIFIED TOP NAVIGATION BAR (Phase 1)
-# ============================================
-# Replaces old top nav + sidebar + duplicate nav buttons
+.stButton > button {
+    background: #ffffff !important;
+    color: #0a0a0a !important;
+}
 
-# Add CSS for clean, professional navigation bar
-st.markdown("""
-<style>
-/* Top Navigation Bar - SaaS Modern (Notion/Linear style) */
-.top-nav-bar {
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    padding: 16px 32px;
-    background: white;
-    border-bottom: 1px solid #e5e7eb;
-    margin-bottom: 0;
-    height: 64px;
-    box-sizing: border-box;
+.stButton > button:hover {
+    background: #e0e0e0 !important;
 }
 
-.top-nav-logo {
-    font-family: var(--font-serif);
-    font-size: 1.25rem;
-    font-weight: 600;
-    color: var(--text-primary);
-    margin: 0;
-    line-height: 1;
+.stFormSubmitButton > button {
+    background: #ffffff !important;
+    color: #0a0a0a !important;
 }
 
-.top-nav-buttons {
-    display: flex;
-    align-items: center;
-    gap: 8px;
+.stDownloadButton > button {
+    background: #1a1a1a !important;
+    color: #e0e0e0 !important;
+    border-color: #4a4a4a !important;
 }
 
-/* Navigation button overrides - ONLY for top nav */
-[data-testid="column"] > div > div > button[data-testid*="baseButton-"] {
-    padding: 12px 20px !important;
-    border-radius: 8px !important;
-    font-size: 15px !important;
-    font-weight: 500 !important;
-    height: 40px !important;
-    min-width: auto !important;
-    white-space: nowrap !important;
-    display: inline-flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    box-sizing: border-box !important;
+.results-summary {
+    background: #1a1a1a !important;
+    border-color: #2a2a2a !important;
 }
 
-/* Gap columns create spacing - no additional margins needed */
-</style>
-""", unsafe_allow_html=True)
+.stDataFrame {
+    border-color: #2a2a2a !important;
+}
 
-# CSS for text-link style buttons (no boxes) and inactive nav buttons
-st.markdown("""
-<style>
-/* Top bar buttons - absolutely no borders or backgrounds - HIGHEST SPECIFICITY */
-.text-link-button > .stButton {
-    margin: 0 !important;
+.streamlit-expanderHeader {
+    background: #1a1a1a !important;
+    color: #e0e0e0 !important;
+    border-color: #2a2a2a !important;
 }
 
-/* Target all button types explicitly with attribute selectors for maximum specificity */
-.text-link-button > .stButton > button[kind="primary"],
-.text-link-button > .stButton > button[kind="secondary"],
-.text-link-button > .stButton > button:not([kind]),
-.text-link-button .stButton > button[kind="primary"],
-.text-link-button .stButton > button[kind="secondary"],
-.text-link-button .stButton > button:not([kind]) {
-    background: transparent !important;
-    border: 0px solid transparent !important;
-    box-shadow: none !important;
-    outline: none !important;
-    color: var(--text-secondary) !important;
-    font-weight: 500 !important;
-    padding: 8px 12px !important;
-    min-width: auto !important;
-    transition: color 0.15s ease !important;
-    line-height: 2.5rem !important;
-    height: 2.5rem !important;
-    display: inline-flex !important;
-    align-items: center !important;
-    vertical-align: middle !important;
+.stTabs {
+    background: #1a1a1a !important;
+    border-color: #2a2a2a !important;
 }
 
-.text-link-button > .stButton > button[kind="primary"]:hover,
-.text-link-button > .stButton > button[kind="secondary"]:hover,
-.text-link-button > .stButton > button:not([kind]):hover,
-.text-link-button .stButton > button[kind="primary"]:hover,
-.text-link-button .stButton > button[kind="secondary"]:hover,
-.text-link-button .stButton > button:not([kind]):hover {
-    background: transparent !important;
-    border: 0px solid transparent !important;
-    box-shadow: none !important;
-    color: var(--primary) !important;
+.stSuccess {
+    background: #1a3a1a !important;
+    border-color: #2a5a2a !important;
+    color: #86efac !important;
 }
 
-.text-link-button > .stButton > button[kind="primary"]:focus,
-.text-link-button > .stButton > button[kind="primary"]:active,
-.text-link-button > .stButton > button[kind="secondary"]:focus,
-.text-link-button > .stButton > button[kind="secondary"]:active,
-.text-link-button > .stButton > button:not([kind]):focus,
-.text-link-button > .stButton > button:not([kind]):active,
-.text-link-button .stButton > button[kind="primary"]:focus,
-.text-link-button .stButton > button[kind="primary"]:active,
-.text-link-button .stButton > button[kind="secondary"]:focus,
-.text-link-button .stButton > button[kind="secondary"]:active,
-.text-link-button .stButton > button:not([kind]):focus,
-.text-link-button .stButton > button:not([kind]):active {
-    background: transparent !important;
-    border: 0px solid transparent !important;
-    box-shadow: none !important;
-    outline: none !important;
+.stInfo {
+    background: #1a2a3a !important;
+    border-color: #2a4a5a !important;
+    color: #7dd3fc !important;
 }
 
-/* Logo text styling */
-.nav-logo-text {
-    font-family: var(--font-serif);
-    font-size: 1.25rem;
-    font-weight: 600;
-    color: var(--text-primary);
-    line-height: 40px;
-    margin: 0;
+hr {
+    border-color: #2a2a2a !important;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# ============================================
+# UNIFIED TOP NAVIGATION BAR (Phase 1)
+# ============================================
+# Replaces old top nav + sidebar + duplicate nav buttons
+# (nav, text-link button and header styles live in static/app.css)
 
 # ============================================
 # PROFESSIONAL HEADER BAR (SaaS Style)
@@ -1490,53 +655,86 @@ def extract_wait_time(error_msg: str) -> int:
 # CSV PARSING AND DATA PROCESSING
 # ============================================================================
 
+# Columns read from a LinkedIn Connections export (lowercased) - everything else is skipped
+LINKEDIN_CSV_COLUMNS = {
+    'first name', 'last name', 'company', 'position', 'title',
+    'email address', 'email', 'connected on', 'url'
+}
+
+# Column names that identify the real header row, matched in one pass over each raw line
+LINKEDIN_HEADER_PATTERN = re.compile(rb'first name|last name|company|position|email')
+
 def parse_linkedin_csv(uploaded_file):
-    """Parse LinkedIn CSV export and return a dataframe"""
+    """Parse LinkedIn CSV export and return a dataframe (reuses the last parse for identical bytes)"""
+    # getvalue() returns the whole buffer regardless of the current file position
+    raw = uploaded_file.getvalue()
+    file_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    cached = st.session_state.get('_parsed_csv')
+    if cached and cached['hash'] == file_hash:
+        # Copy so downstream sanitizing/enrichment can't mutate the cached frame
+        return cached['df'].copy()
+
+    df = _parse_linkedin_csv_bytes(raw)
+    if df is not None:
+        st.session_state['_parsed_csv'] = {'hash': file_hash, 'df': df}
+        return df.copy()
+    return df
+
+def _parse_linkedin_csv_bytes(raw):
+    """Parse the raw bytes of a LinkedIn CSV export into a dataframe"""
     try:
         # LinkedIn exports often have metadata at the top, so we need to find the real headers
-        uploaded_file.seek(0)
-
-        # Read the file line by line to find where the real headers are
-        lines = []
-        for i, line in enumerate(uploaded_file):
-            try:
-                decoded_line = line.decode('utf-8', errors='ignore').strip()
-                lines.append(decoded_line)
-                if i >= 10:  # Only check first 10 lines
-                    break
-            except:
-                continue
+        # Scan the first 10 lines as bytes - no per-line decode needed to spot the header
+        head_lines = raw[:4096].lower().split(b'\n')[:11]
 
         # Find the row that looks like LinkedIn headers
         header_row = 0
-        linkedin_indicators = ['first name', 'last name', 'company', 'position', 'email']
 
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            # Check if this line contains multiple LinkedIn column indicators
-            matches = sum(1 for indicator in linkedin_indicators if indicator in line_lower)
+        for i, line in enumerate(head_lines):
+            # Check if this line contains multiple (distinct) LinkedIn column indicators
+            matches = len(set(LINKEDIN_HEADER_PATTERN.findall(line)))
             if matches >= 2:  # If we find at least 2 LinkedIn column names, this is the header
                 header_row = i
                 st.info(f"Found LinkedIn headers at row {i + 1}")
                 break
 
-        # Now read the CSV with the correct header row
-        uploaded_file.seek(0)
+        # Only parse the columns the app uses - the C parser skips the rest while tokenizing
+        header_columns = []
+
+        def keep_column(col):
+            header_columns.append(col)
+            return col.strip().lower() in LINKEDIN_CSV_COLUMNS
 
+        # Now parse the bytes we already have with the correct header row.
+        # dtype=str skips type inference - every LinkedIn column is text anyway.
         try:
             df = pd.read_csv(
-                uploaded_file,
+                BytesIO(raw),
                 encoding='utf-8',
                 skiprows=header_row,
-                on_bad_lines='skip'
+                on_bad_lines='skip',
+                engine='c',
+                dtype=str,
+                usecols=keep_column
             )
         except Exception:
-            uploaded_file.seek(0)
+            header_columns.clear()
             df = pd.read_csv(
-                uploaded_file,
+                BytesIO(raw),
                 encoding='latin-1',
                 skiprows=header_row,
-                on_bad_lines='skip'
+                on_bad_lines='skip',
+                engine='c',
+                dtype=str,
+                usecols=keep_column
+            )
+
+        if df is not None and len(df.columns) == 0 and header_columns:
+            raise Exception(
+                f"This doesn't look like a LinkedIn Connections export.\n\n"
+                f"Found columns: {', '.join(str(c) for c in dict.fromkeys(header_columns))}\n\n"
+                f"Expected columns like: First Name, Last Name, Company, Position"
             )
 
         if df is None or df.empty:
@@ -1565,12 +763,16 @@ def parse_linkedin_csv(uploaded_file):
 
         # Create full name if we have first and last
         if 'first_name' in df.columns and 'last_name' in df.columns:
-            df['full_name'] = df['first_name'].fillna('') + ' ' + df['last_name'].fillna('')
-            df['full_name'] = df['full_name'].str.strip()
+            # One concat pass; na_rep covers missing first/last names
+            df['full_name'] = df['first_name'].str.cat(df['last_name'], sep=' ', na_rep='').str.strip()
 
         # Fill NaN values
         df = df.fillna('')
 
+        # Store text as packed Arrow buffers when pyarrow is installed
+        if HAS_PYARROW:
+            df = df.astype('string[pyarrow]')
+
         # Validate we have at least one required column
         required_cols = ['full_name', 'first_name', 'company', 'position']
         has_required = any(col in df.columns for col in required_cols)
@@ -1587,47 +789,174 @@ def parse_linkedin_csv(uploaded_file):
     except Exception as e:
         st.error(f"**Error parsing CSV:** {str(e)}")
 
-        with st.expander("📖 How to Download Your LinkedIn Connections"):
-            st.markdown("""
-            **Step-by-step instructions:**
+        with st.expander("📖 How to Download Your LinkedIn Connections"):
+            st.markdown("""
+            **Step-by-step instructions:**
+
+            1. Go to [linkedin.com/mypreferences/d/download-my-data](https://www.linkedin.com/mypreferences/d/download-my-data)
+            2. Click **"Request archive"** (not "Want something in particular?")
+            3. LinkedIn will email you when ready (usually 10-15 minutes)
+            4. Download and **extract the ZIP file**
+            5. Inside, look for the **`Connections.csv`** file
+            6. Upload that file here
+
+            **The file should have columns like:**
+            - First Name
+            - Last Name
+            - Company
+            - Position
+            - Email Address
+            - Connected On
+
+            The app will automatically skip any metadata rows at the top of the file.
+            """)
+
+        return None
+
+# Cap on how many companies are listed in the intent prompt - input tokens (and
+# latency/cost) otherwise grow linearly with network size
+MAX_PROMPT_COMPANIES = 300
+MAX_PROMPT_POSITIONS = 20
+
+# Intent extraction is a small structured-JSON task, so the fast model handles it;
+# ranking queries ("most senior", "top 3") are escalated to the larger model
+INTENT_MODEL = "gpt-4o-mini"
+INTENT_RANKING_MODEL = "gpt-4o"
+RANKING_QUERY_HINTS = ('most senior', 'highest', 'top ', 'best', 'senior-most')
+
+# Local fast path for simple queries - role words we can match without the LLM...
+LOCAL_ROLE_PATTERN = re.compile(
+    r'\b(product managers?|engineers?|developers?|managers?|directors?|designers?|analysts?|'
+    r'founders?|recruiters?|consultants?|scientists?|researchers?|ceos?|ctos?|cfos?|coos?|vps?)\b',
+    re.IGNORECASE
+)
+# ...and words that need world knowledge or ranking, which always go to the LLM
+SEMANTIC_QUERY_PATTERN = re.compile(
+    r'\b(tech|technology|finance|financial|industry|industries|sector|startups?|'
+    r'senior|seniority|top|best|most|highest|similar|like)\b',
+    re.IGNORECASE
+)
+
+def _normalize_for_match(text):
+    """Lowercase and collapse punctuation to single spaces for whole-word matching"""
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+def _get_unique_values_cache(contacts_df):
+    """
+    Build (or reuse) the unique company/position lists for a contacts DataFrame
+
+    Cached in session_state per DataFrame (by identity and length) so repeat
+    searches over the same contacts skip the two full-column scans and the
+    JSON serialization of the prompt lists.
+    """
+    cached = st.session_state.get('_unique_values_cache')
+    # The cache holds a reference to the frame, so an identity match can't be a recycled id()
+    if cached and cached['frame'] is contacts_df and cached['rows'] == len(contacts_df):
+        return cached
+
+    # value_counts orders by frequency, so prompt truncation keeps the most common values
+    all_companies = contacts_df['company'].value_counts().index.tolist()
+    all_companies = [c for c in all_companies if c]  # Remove empty strings
+
+    all_positions = contacts_df['position'].value_counts().index.tolist()
+    all_positions = [p for p in all_positions if p]  # Remove empty strings
+
+    cached = {
+        'frame': contacts_df,
+        'rows': len(contacts_df),
+        'companies': all_companies,
+        'positions': all_positions,
+        'companies_json': json.dumps(all_companies[:MAX_PROMPT_COMPANIES]),
+        'positions_json': json.dumps(all_positions[:MAX_PROMPT_POSITIONS]),
+        'companies_normalized': {_normalize_for_match(c): c for c in all_companies}
+    }
+    st.session_state['_unique_values_cache'] = cached
+    return cached
+
+def get_unique_companies_positions(contacts_df):
+    """
+    Get unique non-empty companies and positions, most frequent first
+
+    Returns:
+        Tuple of (all_companies, all_positions) lists
+    """
+    cached = _get_unique_values_cache(contacts_df)
+    return cached['companies'], cached['positions']
+
+def get_prompt_companies_positions_json(contacts_df):
+    """
+    Get the truncated company/position lists as ready-to-embed JSON strings
+
+    Returns:
+        Tuple of (companies_json, positions_json) strings
+    """
+    cached = _get_unique_values_cache(contacts_df)
+    return cached['companies_json'], cached['positions_json']
+
+def match_intent_locally(query, contacts_df):
+    """
+    Resolve simple queries ("who works at Stripe", "engineers") without calling the LLM
+
+    Only handles queries that name companies from the dataset OR role words, not both -
+    filter_contacts ORs its criteria, so combined queries still need the LLM.
+
+    Returns:
+        Intent dict in the same shape as the LLM's, or None to fall back to the LLM
+    """
+    if SEMANTIC_QUERY_PATTERN.search(query):
+        return None
+
+    padded_query = f" {_normalize_for_match(query)} "
+    companies_normalized = _get_unique_values_cache(contacts_df)['companies_normalized']
+    matching_companies = [
+        company for normalized, company in companies_normalized.items()
+        if len(normalized) > 2 and f" {normalized} " in padded_query
+    ]
+    # Singular form so "engineers" also matches "Engineer" titles
+    role_keywords = sorted({
+        match.group(1).lower().rstrip('s') for match in LOCAL_ROLE_PATTERN.finditer(query)
+    })
+
+    if bool(matching_companies) == bool(role_keywords):
+        return None
 
-            1. Go to [linkedin.com/mypreferences/d/download-my-data](https://www.linkedin.com/mypreferences/d/download-my-data)
-            2. Click **"Request archive"** (not "Want something in particular?")
-            3. LinkedIn will email you when ready (usually 10-15 minutes)
-            4. Download and **extract the ZIP file**
-            5. Inside, look for the **`Connections.csv`** file
-            6. Upload that file here
+    summary = f"People at {', '.join(matching_companies)}" if matching_companies else f"People working as {', '.join(role_keywords)}"
+    return {
+        'matching_companies': matching_companies,
+        'matching_position_keywords': role_keywords,
+        'matching_name_keywords': [],
+        'requires_ranking': False,
+        'ranking_criteria': None,
+        'limit_results': None,
+        'summary': summary
+    }
 
-            **The file should have columns like:**
-            - First Name
-            - Last Name
-            - Company
-            - Position
-            - Email Address
-            - Connected On
+@st.cache_resource
+def get_api_executor():
+    """Shared thread pool for OpenAI calls that can run alongside other work"""
+    return ThreadPoolExecutor(max_workers=8)
 
-            The app will automatically skip any metadata rows at the top of the file.
-            """)
+def start_search_intent_request(query, contacts_df):
+    """
+    Build the intent prompt and submit the OpenAI call on a background thread
 
-        return None
+    Lets callers overlap the intent request with other slow work (e.g. the analytics
+    call for hybrid queries). Pass the returned future to extract_search_intent.
 
-def extract_search_intent(query, contacts_df):
-    """Use OpenAI to intelligently match the query against the dataset using its world knowledge"""
+    Returns:
+        concurrent.futures.Future resolving to the chat completion response
+    """
 
     # Get all unique companies and positions from the dataset
-    all_companies = contacts_df['company'].unique().tolist()
-    all_companies = [c for c in all_companies if c]  # Remove empty strings
-
-    all_positions = contacts_df['position'].unique().tolist()
-    all_positions = [p for p in all_positions if p]  # Remove empty strings
+    companies_json, positions_json = get_prompt_companies_positions_json(contacts_df)
 
     system_prompt = f"""You are an intelligent search assistant with deep knowledge about companies, industries, and job roles.
 
 The user has a dataset of LinkedIn contacts with these companies:
-{json.dumps(all_companies)}
+{companies_json}
 
 And these job positions:
-{json.dumps(all_positions[:20])}
+{positions_json}
 
 The user will ask a natural language question about their network. Your job is to use YOUR KNOWLEDGE about industries, companies, and roles to identify which contacts match their query.
 
@@ -1653,18 +982,50 @@ BE INTELLIGENT:
 
 Return ONLY valid JSON, no other text."""
 
+    needs_ranking = any(hint in query.lower() for hint in RANKING_QUERY_HINTS)
+
+    # The client is resolved here on the script thread (it may call st.error/st.stop);
+    # only the network request itself runs in the worker.
+    # SDK retries are disabled so they don't stack with call_with_backoff
+    create = get_client().with_options(max_retries=0).chat.completions.create
+    return get_api_executor().submit(
+        call_with_backoff,
+        create,
+        model=INTENT_RANKING_MODEL if needs_ranking else INTENT_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": query}
+        ],
+        temperature=0.3,
+        response_format={"type": "json_object"}
+    )
+
+def extract_search_intent(query, contacts_df, pending_request=None):
+    """Use OpenAI to intelligently match the query against the dataset using its world knowledge"""
+    query_lower = query.lower()
+
+    # Simple company/role lookups don't need a network round trip
+    if pending_request is None:
+        local_intent = match_intent_locally(query, contacts_df)
+        if local_intent:
+            return local_intent
+
     try:
-        response = get_client().chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": query}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
+        if pending_request is None:
+            pending_request = start_search_intent_request(query, contacts_df)
+        response = pending_request.result()
 
         intent = json.loads(response.choices[0].message.content)
+
+        # The prompt only listed the most frequent companies - if the model found none,
+        # check whether the query names one of the companies that was left out
+        all_companies, _ = get_unique_companies_positions(contacts_df)
+        if len(all_companies) > MAX_PROMPT_COMPANIES and not intent.get('matching_companies'):
+            intent['matching_companies'] = [
+                c for c in all_companies[MAX_PROMPT_COMPANIES:]
+                if len(c) > 2 and c.lower() in query_lower
+            ]
+
         return intent
     except Exception as e:
         error_msg = str(e)
@@ -1690,38 +1051,94 @@ Return ONLY valid JSON, no other text."""
 
         return None
 
+def optimize_contact_dtypes(contacts_df):
+    """
+    Convert a freshly loaded contacts frame to compact column dtypes
+
+    company repeats heavily, so it becomes a category - value_counts and equality
+    checks then work on small integer codes. The other text columns become
+    Arrow-backed strings when pyarrow is installed. Call once, after any enrichment
+    that rewrites values (new values can't be assigned into a category).
+    """
+    df = contacts_df.copy()
+
+    if 'company' in df.columns:
+        # Fill first: fillna('') on a category without '' would raise downstream
+        df['company'] = df['company'].fillna('').astype(str).astype('category')
+
+    if HAS_PYARROW:
+        for col in ('position', 'full_name', 'email'):
+            if col in df.columns:
+                # Fill first so card/export code never sees pd.NA (its truthiness raises)
+                df[col] = df[col].fillna('').astype('string[pyarrow]')
+
+    return df
+
+# Frames whose lowercased columns are kept: My Network, Extended Network and the two combined
+LOWERCASED_FRAMES_MAX = 3
+
+def get_lowercased_column(df, column):
+    """
+    Get a lowercased copy of a contacts column, cached per DataFrame in session_state
+
+    Searches run against the same contacts frames over and over, so each column
+    is lowercased once instead of once per keyword per query. A few frames are kept,
+    so switching between the networks being searched doesn't evict the others.
+    """
+    frames = st.session_state.setdefault('_lowercased_frames', OrderedDict())
+    entry = frames.get(id(df))
+    if entry is None or entry['frame'] is not df or entry['rows'] != len(df):
+        entry = {'frame': df, 'rows': len(df), 'columns': {}}
+        frames[id(df)] = entry
+        while len(frames) > LOWERCASED_FRAMES_MAX:
+            frames.popitem(last=False)
+    frames.move_to_end(id(df))
+
+    if column not in entry['columns']:
+        entry['columns'][column] = df[column].fillna('').astype(str).str.lower()
+    return entry['columns'][column]
+
+def contains_any(column_lc, keywords):
+    """Boolean array: which rows of a lowercased column contain any of the keywords (one regex scan)"""
+    keywords = {keyword.lower() for keyword in keywords if keyword}
+    if not keywords:
+        return np.zeros(len(column_lc), dtype=bool)
+    pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+    return column_lc.str.contains(pattern, regex=True, na=False).to_numpy()
+
 def filter_contacts(df, intent):
     """Filter contacts based on AI's intelligent matching"""
 
     if df.empty or not intent:
         return df
 
-    # Start with no matches
-    final_mask = pd.Series([False] * len(df))
+    # Start with no matches (plain bool array; every arm ORs in a .to_numpy() result)
+    final_mask = np.zeros(len(df), dtype=bool)
 
     # Filter by matching companies (AI has used its knowledge to identify these)
     if intent.get('matching_companies'):
-        for company in intent['matching_companies']:
-            # Case-insensitive exact match or contains
-            final_mask |= df['company'].str.lower() == company.lower()
-            # Also try partial match in case of slight variations
-            final_mask |= df['company'].str.lower().str.contains(company.lower(), na=False)
+        company_lc = get_lowercased_column(df, 'company')
+        company_set = {company.lower() for company in intent['matching_companies'] if company}
+        if company_set:
+            # Case-insensitive exact match (hash lookup)...
+            final_mask |= company_lc.isin(company_set).to_numpy()
+            # ...plus partial match in case of slight variations
+            final_mask |= contains_any(company_lc, company_set)
 
     # Filter by position keywords
     if intent.get('matching_position_keywords'):
-        for keyword in intent['matching_position_keywords']:
-            keyword_lower = keyword.lower()
-            final_mask |= df['position'].str.lower().str.contains(keyword_lower, na=False)
+        position_lc = get_lowercased_column(df, 'position')
+        final_mask |= contains_any(position_lc, intent['matching_position_keywords'])
 
     # Filter by name keywords (if searching for specific people)
     if intent.get('matching_name_keywords'):
-        for keyword in intent['matching_name_keywords']:
-            keyword_lower = keyword.lower()
-            if 'full_name' in df.columns:
-                final_mask |= df['full_name'].str.lower().str.contains(keyword_lower, na=False)
+        if 'full_name' in df.columns:
+            full_name_lc = get_lowercased_column(df, 'full_name')
+            final_mask |= contains_any(full_name_lc, intent['matching_name_keywords'])
 
-    # Get filtered results
-    filtered_df = df[final_mask].copy()
+    # Get filtered results by position (iloc already returns a new frame, and nothing
+    # downstream mutates it, so no extra .copy())
+    filtered_df = df.iloc[np.flatnonzero(final_mask)]
 
     # Handle ranking queries (e.g., "most senior person")
     if intent.get('requires_ranking') and intent.get('ranking_criteria') == 'seniority':
@@ -1729,69 +1146,101 @@ def filter_contacts(df, intent):
 
     return filtered_df
 
-def rank_by_seniority(df, limit=None):
-    """Rank contacts by seniority level based on their job title"""
-
-    if df.empty:
-        return df
+# Seniority scores for common title keywords (a title scores its best-matching keyword)
+SENIORITY_KEYWORDS = {
+    # C-level and founders
+    'ceo': 100, 'chief executive': 100, 'founder': 100, 'co-founder': 100,
+    'cto': 95, 'chief technology': 95, 'cfo': 95, 'chief financial': 95,
+    'coo': 95, 'chief operating': 95, 'cmo': 95, 'chief marketing': 95,
 
-    # Define seniority scores for common titles
-    seniority_keywords = {
-        # C-level and founders
-        'ceo': 100, 'chief executive': 100, 'founder': 100, 'co-founder': 100,
-        'cto': 95, 'chief technology': 95, 'cfo': 95, 'chief financial': 95,
-        'coo': 95, 'chief operating': 95, 'cmo': 95, 'chief marketing': 95,
+    # Executive level
+    'president': 90, 'vp': 85, 'vice president': 85, 'svp': 87, 'evp': 88,
 
-        # Executive level
-        'president': 90, 'vp': 85, 'vice president': 85, 'svp': 87, 'evp': 88,
+    # Partner level (VC/Consulting)
+    'general partner': 90, 'managing partner': 90, 'partner': 80,
 
-        # Partner level (VC/Consulting)
-        'general partner': 90, 'managing partner': 90, 'partner': 80,
+    # Director level
+    'director': 70, 'head of': 70,
 
-        # Director level
-        'director': 70, 'head of': 70,
+    # Principal/Staff
+    'principal': 65, 'staff': 60, 'distinguished': 65,
 
-        # Principal/Staff
-        'principal': 65, 'staff': 60, 'distinguished': 65,
+    # Senior/Lead
+    'senior': 50, 'lead': 45, 'sr': 50,
 
-        # Senior/Lead
-        'senior': 50, 'lead': 45, 'sr': 50,
+    # Manager
+    'manager': 40, 'engineering manager': 45,
 
-        # Manager
-        'manager': 40, 'engineering manager': 45,
-
-        # Individual contributor
-        'engineer': 30, 'developer': 30, 'analyst': 30, 'associate': 25,
-        'designer': 30, 'scientist': 35, 'researcher': 35,
-    }
+    # Individual contributor
+    'engineer': 30, 'developer': 30, 'analyst': 30, 'associate': 25,
+    'designer': 30, 'scientist': 35, 'researcher': 35,
+}
 
-    # Calculate seniority score for each contact
-    def calculate_seniority_score(position):
-        if pd.isna(position) or not position:
-            return 0
+# Keywords ordered by score (highest first), so the first keyword found in a title is its best
+SENIORITY_BY_SCORE = sorted(SENIORITY_KEYWORDS.items(), key=lambda item: -item[1])
 
-        position_lower = position.lower()
-        score = 0
+def seniority_score(position_lower):
+    """Score one lowercased title by its highest-ranking seniority keyword (0 if none)"""
+    for keyword, points in SENIORITY_BY_SCORE:
+        if keyword in position_lower:
+            return points
+    return 0
 
-        for keyword, points in seniority_keywords.items():
-            if keyword in position_lower:
-                score = max(score, points)  # Take highest matching score
+def compute_seniority_scores(positions):
+    """
+    Score each position title by its highest-ranking seniority keyword
 
-        return score
+    Args:
+        positions: Series of job titles
 
-    df['seniority_score'] = df['position'].apply(calculate_seniority_score)
+    Returns:
+        int16 numpy array of scores (0 for blank/unmatched titles)
+    """
+    positions_lower = positions.fillna('').astype(str).str.lower()
+
+    # Titles repeat a lot ("Software Engineer"), so score each distinct title once and map back
+    codes, unique_titles = pd.factorize(positions_lower)
+    unique_scores = np.fromiter(
+        map(seniority_score, unique_titles),
+        dtype=np.int16,
+        count=len(unique_titles)
+    )
+    return unique_scores[codes]
 
-    # Sort by seniority score (highest first)
-    df = df.sort_values('seniority_score', ascending=False)
+def rank_by_seniority(df, limit=None):
+    """Rank contacts by seniority level based on their job title"""
 
-    # Remove the score column before returning
-    result_df = df.drop('seniority_score', axis=1)
+    if df.empty:
+        return df
 
-    # Limit results if specified
-    if limit and limit > 0:
-        result_df = result_df.head(limit)
+    scores = compute_seniority_scores(df['position'])
 
-    return result_df
+    if limit and 0 < limit < len(scores):
+        # Top-k only: partition in O(n), then sort just the k winners (highest first)
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        order = top[np.argsort(-scores[top], kind='stable')]
+    else:
+        # Sort by seniority score (highest first)
+        order = np.argsort(-scores, kind='stable')
+
+    return df.iloc[order]
+
+def top_value_counts(column, k=3):
+    """Return the k most frequent values of a column as a count Series (like value_counts().head(k))"""
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return column.value_counts().head(k)
+
+    # Integer histogram over the category codes instead of hashing strings
+    codes = column.cat.codes.to_numpy()
+    categories = column.cat.categories
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    if len(counts) > k:
+        top_idx = np.argpartition(-counts, k)[:k]
+    else:
+        top_idx = np.arange(len(counts))
+    top_idx = top_idx[np.argsort(-counts[top_idx], kind='stable')]
+    top_idx = top_idx[counts[top_idx] > 0]
+    return pd.Series(counts[top_idx], index=categories[top_idx])
 
 def generate_summary(filtered_df, intent):
     """Generate a natural language summary of the results"""
@@ -1802,8 +1251,8 @@ def generate_summary(filtered_df, intent):
         return "I couldn't find any contacts matching your criteria."
 
     # Get top companies and positions
-    top_companies = filtered_df['company'].value_counts().head(3)
-    top_positions = filtered_df['position'].value_counts().head(3)
+    top_companies = top_value_counts(filtered_df['company'])
+    top_positions = top_value_counts(filtered_df['position'])
 
     summary_parts = [f"**Found {count} contact{'s' if count != 1 else ''}**"]
 
@@ -1822,43 +1271,157 @@ def generate_summary(filtered_df, intent):
 
     return "\n".join(summary_parts)
 
+# Phrases that mark a query as ANALYTICS, compiled into one case-insensitive alternation
+ANALYTICS_QUERY_PATTERN = re.compile('|'.join(map(re.escape, [
+    'how many', 'what percentage', 'what percent', 'breakdown', 'distribution',
+    'summarize', 'summary', 'analyze', 'analysis', 'most common', 'least common',
+    'what industry', 'which industry', 'which companies', 'top companies',
+    'how diverse', 'composition', 'split between', 'ratio', 'compare'
+])), re.IGNORECASE)
+
+# Analytics phrasings that also want the matching people listed (hybrid queries)
+HYBRID_QUERY_PATTERN = re.compile(r'how many (?:people|contacts)|who all', re.IGNORECASE)
+
 def classify_query_type(query):
     """
     Determine if a query is a SEARCH (return people) or ANALYTICS (return insights)
 
     Returns: "search" or "analytics"
     """
-    query_lower = query.lower()
+    # Check for analytics keywords
+    if ANALYTICS_QUERY_PATTERN.search(query):
+        return "analytics"
 
-    # Analytics keywords
-    analytics_keywords = [
-        'how many', 'what percentage', 'what percent', 'breakdown', 'distribution',
-        'summarize', 'summary', 'analyze', 'analysis', 'most common', 'least common',
-        'what industry', 'which industry', 'which companies', 'top companies',
-        'how diverse', 'composition', 'split between', 'ratio', 'compare'
-    ]
+    # Everything else - explicit search phrasing ("who", "show me", "find", ...) or not -
+    # is a search (finding people is the primary use case)
+    return "search"
 
-    # Search keywords
-    search_keywords = [
-        'who', 'show me', 'find', 'list', 'get me', 'looking for',
-        'introduce me', 'connect me', 'know anyone'
-    ]
+# Bound on the process-wide exact-match cache of chat replies
+CHAT_CACHE_MAX_ENTRIES = 2048
+
+@st.cache_resource
+def get_chat_response_cache():
+    """Process-wide LRU of chat replies (prompt hash -> text), shared by all sessions"""
+    return {'replies': OrderedDict(), 'lock': threading.Lock()}
+
+def chat_cache_key(model, system_message, user_message, temperature, max_tokens=None):
+    """Key of a chat reply in the exact-match cache"""
+    return hashlib.blake2b(
+        json.dumps([model, system_message, user_message, temperature, max_tokens]).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+
+def get_cached_chat_reply(cache_key):
+    """The cached reply for a chat_cache_key(), or None"""
+    cache = get_chat_response_cache()
+    with cache['lock']:
+        cached_reply = cache['replies'].get(cache_key)
+        if cached_reply is not None:
+            cache['replies'].move_to_end(cache_key)
+    return cached_reply
+
+def stream_chat_completion(model, system_message, user_message, temperature, max_tokens=None):
+    """
+    Stream a chat completion's text, caching the full reply by its exact inputs
 
-    # Check for analytics keywords
-    if any(keyword in query_lower for keyword in analytics_keywords):
-        return "analytics"
+    Only for deterministic-ish prompts (low temperature) where an identical prompt
+    should get the same answer - repeats are yielded from the cache in one chunk.
+    The reply is only cached once the stream completes, so errors are never cached.
+    """
+    cache = get_chat_response_cache()
+    cache_key = chat_cache_key(model, system_message, user_message, temperature, max_tokens)
 
-    # Check for search keywords
-    if any(keyword in query_lower for keyword in search_keywords):
-        return "search"
+    cached_reply = get_cached_chat_reply(cache_key)
+    if cached_reply is not None:
+        yield cached_reply
+        return
 
-    # Default to search (finding people is the primary use case)
-    return "search"
+    stream = get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+
+    parts = []
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            yield delta
+
+    with cache['lock']:
+        cache['replies'][cache_key] = ''.join(parts)
+        while len(cache['replies']) > CHAT_CACHE_MAX_ENTRIES:
+            cache['replies'].popitem(last=False)
+
+# Paraphrased analytics questions about the same network reuse an earlier answer
+SEMANTIC_CACHE_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX_NETWORKS = 256
+SEMANTIC_CACHE_MAX_ANSWERS = 64
+
+@st.cache_resource
+def get_semantic_answer_cache():
+    """Process-wide LRU of network snapshot -> (query embeddings, answers), shared by all sessions"""
+    return {'networks': OrderedDict(), 'lock': threading.Lock()}
+
+def embed_query(query):
+    """Unit-length embedding of a query, or None if the embedding call fails"""
+    try:
+        response = get_client().embeddings.create(model=SEMANTIC_CACHE_MODEL, input=query)
+    except Exception:
+        return None
+    embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+    norm = np.linalg.norm(embedding)
+    return embedding / norm if norm else None
 
-def analyze_network_with_ai(query, contacts_df):
+def find_similar_answer(snapshot_key, query_embedding):
+    """Return a cached answer for a near-identical question about the same network, if any"""
+    if query_embedding is None:
+        return None
+
+    cache = get_semantic_answer_cache()
+    with cache['lock']:
+        entry = cache['networks'].get(snapshot_key)
+        if entry is None or not entry['answers']:
+            return None
+        cache['networks'].move_to_end(snapshot_key)
+        embeddings = np.vstack(entry['embeddings'])
+        answers = list(entry['answers'])
+
+    # Embeddings are unit length, so the dot product is the cosine similarity
+    similarities = embeddings @ query_embedding
+    best = int(np.argmax(similarities))
+    return answers[best] if similarities[best] >= SEMANTIC_CACHE_THRESHOLD else None
+
+def remember_answer(snapshot_key, query_embedding, answer):
+    """Store an answer under its question embedding for later paraphrases"""
+    if query_embedding is None or not answer:
+        return
+
+    cache = get_semantic_answer_cache()
+    with cache['lock']:
+        entry = cache['networks'].setdefault(snapshot_key, {'embeddings': [], 'answers': []})
+        cache['networks'].move_to_end(snapshot_key)
+        entry['embeddings'].append(query_embedding)
+        entry['answers'].append(answer)
+        del entry['embeddings'][:-SEMANTIC_CACHE_MAX_ANSWERS]
+        del entry['answers'][:-SEMANTIC_CACHE_MAX_ANSWERS]
+        while len(cache['networks']) > SEMANTIC_CACHE_MAX_NETWORKS:
+            cache['networks'].popitem(last=False)
+
+def analyze_network_with_ai(query, contacts_df, stream_to=None):
     """
     Use AI to analyze the user's network and answer analytical questions
 
+    If stream_to (a Streamlit container, e.g. st.empty()) is given, the answer is
+    written into it token by token as it arrives.
+
     Examples:
     - "What industry do I have most contacts in?"
     - "How many engineers vs managers?"
@@ -1868,18 +1431,15 @@ def analyze_network_with_ai(query, contacts_df):
     # Aggregate network data for GPT
     total_contacts = len(contacts_df)
 
-    # Get company distribution
-    company_counts = contacts_df['company'].value_counts().head(20).to_dict()
-
-    # Get position distribution
-    position_counts = contacts_df['position'].value_counts().head(20).to_dict()
-
-    # Create summary for GPT
-    network_summary = {
-        "total_contacts": total_contacts,
-        "top_companies": company_counts,
-        "top_positions": position_counts
-    }
+    # Only the top 15 of each are sent, so only those are computed
+    company_lines = '\n'.join(
+        f"  - {company}: {count} contacts"
+        for company, count in top_value_counts(contacts_df['company'], 15).items()
+    )
+    position_lines = '\n'.join(
+        f"  - {position}: {count} contacts"
+        for position, count in top_value_counts(contacts_df['position'], 15).items()
+    )
 
     # Build prompt for GPT
     prompt = f"""You are analyzing a professional's LinkedIn network. Answer their question using the network data provided.
@@ -1888,10 +1448,10 @@ NETWORK DATA:
 - Total contacts: {total_contacts}
 
 Top Companies (with contact count):
-{chr(10).join([f"  - {company}: {count} contacts" for company, count in list(company_counts.items())[:15]])}
+{company_lines}
 
 Top Positions/Titles (with contact count):
-{chr(10).join([f"  - {position}: {count} contacts" for position, count in list(position_counts.items())[:15]])}
+{position_lines}
 
 USER'S QUESTION: {query}
 
@@ -1903,21 +1463,42 @@ Analyze the data and provide a clear, insightful answer. Use your world knowledg
 
 Answer:"""
 
+    # Answers only carry over between paraphrases while the network data is unchanged
+    snapshot_key = hashlib.blake2b(
+        f"{total_contacts}\n{company_lines}\n{position_lines}".encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+
+    chat_args = dict(
+        model="gpt-4-turbo-preview",
+        system_message="You are an expert at analyzing professional networks and providing actionable insights.",
+        user_message=prompt,
+        temperature=0.3,
+        max_tokens=600
+    )
+
     try:
-        response = get_client().chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": "You are an expert at analyzing professional networks and providing actionable insights."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=600
-        )
+        # An exact repeat is answered from the chat cache without an embeddings
+        # round trip; only a miss pays for one to look for a paraphrase
+        answer = get_cached_chat_reply(chat_cache_key(**chat_args))
+        if answer is not None:
+            answer = answer.strip()
+        else:
+            query_embedding = embed_query(query)
+            answer = find_similar_answer(snapshot_key, query_embedding)
 
-        answer = response.choices[0].message.content.strip()
+        if answer is None:
+            answer_stream = stream_chat_completion(**chat_args)
+            if stream_to is not None:
+                answer = stream_to.write_stream(answer_stream)
+            else:
+                answer = ''.join(answer_stream)
+            answer = answer.strip()
+            remember_answer(snapshot_key, query_embedding, answer)
 
         # Log analytics query
-        analytics.log_search_query(
+        log_analytics(
+            'log_search_query',
             query=query,
             results_count=0,  # Analytics queries don't return contacts
             intent={"type": "analytics"},
@@ -1935,6 +1516,20 @@ Answer:"""
             'error': str(e)
         }
 
+EMAIL_ENVELOPE_TEMPLATE = (
+    "<div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;'>"
+    "<div style='color: #666; font-size: 0.9rem;'>TO:</div>"
+    "<div style='font-weight: 600; margin-bottom: 0.5rem;'>{name} ({email})</div>"
+    "<div style='color: #666; font-size: 0.9rem;'>{position} at {company}</div>"
+    "</div>"
+)
+
+def build_email_envelope_html(draft):
+    """The "TO:" header shown above an email draft"""
+    return EMAIL_ENVELOPE_TEMPLATE.format_map({
+        field: sanitize_html(draft[field]) for field in ('name', 'email', 'position', 'company')
+    })
+
 def generate_personalized_emails(selected_contacts, email_purpose="🤝 Just catching up / Reconnecting", email_tone="Friendly & Casual", additional_context=""):
     """Generate personalized outreach emails for each selected contact using AI"""
 
@@ -1962,19 +1557,15 @@ def generate_personalized_emails(selected_contacts, email_purpose="🤝 Just cat
     purpose_instruction = purpose_instructions.get(email_purpose, "reconnect and catch up")
     tone_instruction = tone_instructions.get(email_tone, "Use a warm, friendly tone")
 
-    emails = []
+    # Resolved once on the script thread; workers only make the network calls
+    client = get_client()
 
-    for _, row in selected_contacts.iterrows():
-        name = row.get('full_name', 'Unknown')
-        position = row.get('position', 'Unknown position')
-        company = row.get('company', 'Unknown company')
-        email = row.get('email', 'No email')
-
-        # Build context section if additional context is provided
-        context_section = ""
-        if additional_context and additional_context.strip():
-            context_section = f"\n\nADDITIONAL CONTEXT ABOUT OUR RELATIONSHIP:\n{additional_context.strip()}\n\nIMPORTANT: Use this context to make the email more personal and authentic. Reference specific details if they're relevant to this person."
+    # Build context section if additional context is provided
+    context_section = ""
+    if additional_context and additional_context.strip():
+        context_section = f"\n\nADDITIONAL CONTEXT ABOUT OUR RELATIONSHIP:\n{additional_context.strip()}\n\nIMPORTANT: Use this context to make the email more personal and authentic. Reference specific details if they're relevant to this person."
 
+    def generate_one(name, position, company, email):
         # Use AI to generate a personalized email
         prompt = f"""Write a personalized outreach email to this person from my LinkedIn network:
 
@@ -1998,7 +1589,7 @@ The email should:
 Return the email with a subject line."""
 
         try:
-            response = get_client().chat.completions.create(
+            response = client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that writes warm, personalized networking emails."},
@@ -2007,29 +1598,89 @@ Return the email with a subject line."""
                 temperature=0.7
             )
 
-            email_text = response.choices[0].message.content
-
             # Return as dictionary for tabbed display
-            emails.append({
+            return {
                 "name": name,
                 "email": email,
                 "position": position,
                 "company": company,
-                "email_text": email_text
-            })
+                "email_text": response.choices[0].message.content
+            }
 
         except Exception as e:
-            emails.append({
+            return {
                 "name": name,
                 "email": email,
                 "position": position,
                 "company": company,
                 "email_text": f"ERROR: {str(e)}\n\nPlease check your OpenAI API key and credits.",
                 "error": True
-            })
+            }
+
+    # Emails are independent, so request them concurrently on the shared pool
+    # (bounded by its worker count) rather than one after another
+    executor = get_api_executor()
+    futures = [
+        executor.submit(
+            generate_one,
+            contact.get('full_name', 'Unknown'),
+            contact.get('position', 'Unknown position'),
+            contact.get('company', 'Unknown company'),
+            contact.get('email', 'No email')
+        )
+        for contact in selected_contacts.to_dict('records')
+    ]
+
+    # Results come back in the same order as the selected contacts
+    emails = [future.result() for future in futures]
+
+    # Drafts don't change after generation, so their "TO:" header is rendered once here
+    # rather than on every rerun that displays them
+    for draft in emails:
+        draft['envelope_html'] = build_email_envelope_html(draft)
 
     return emails
 
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cached_contact_count(user_id):
+    """auth.get_contact_count, cached briefly - it's read on every rerun (header + upload card)"""
+    return auth.get_contact_count(user_id)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cached_user_connections(user_id, status='accepted'):
+    """collaboration.get_user_connections, cached briefly - the Connections tab reads it on every rerun"""
+    return collaboration.get_user_connections(user_id, status=status)
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def get_extended_network_contacts(user_id):
+    """
+    collaboration.get_contacts_from_connected_users, cached briefly per user
+
+    It is read on every rerun for the network count and again for each search. Returning
+    the same frame object lets get_lowercased_column() and get_combined_search_frame()
+    reuse their work across searches instead of redoing it for a fresh frame each time.
+    Callers must not modify the returned frame in place.
+    """
+    return collaboration.get_contacts_from_connected_users(user_id)
+
+def get_combined_search_frame(contacts_df, extended_contacts_df):
+    """
+    My Network and Extended Network contacts in one frame, deduplicated by email
+
+    Cached in session state per pair of source frames, so searching both networks
+    again reuses the same combined frame (and its lowercased columns) instead of
+    concatenating a new one for every search. Callers must not modify it in place.
+    """
+    cached = st.session_state.get('_combined_search_frame')
+    if cached is None or cached['mine'] is not contacts_df or cached['extended'] is not extended_contacts_df:
+        combined = pd.concat([contacts_df, extended_contacts_df], ignore_index=True)
+        # Remove duplicates based on email (if present)
+        if 'email' in combined.columns:
+            combined = combined.drop_duplicates(subset=['email'], keep='first')
+        cached = {'mine': contacts_df, 'extended': extended_contacts_df, 'frame': combined}
+        st.session_state['_combined_search_frame'] = cached
+    return cached['frame']
+
 # Authentication UI Functions
 def show_login_page():
     """Display login page"""
@@ -2127,7 +1778,7 @@ def show_login_page():
                                     # Load user's contacts from database
                                     contacts_df = auth.load_user_contacts(result['user']['id'])
                                     if contacts_df is not None:
-                                        st.session_state['contacts_df'] = contacts_df
+                                        st.session_state['contacts_df'] = optimize_contact_dtypes(contacts_df)
 
                                     st.success(f"Welcome back, {result['user']['full_name']}!")
                                     st.rerun()
@@ -2345,27 +1996,27 @@ def show_profile_page():
         # Current Role
         visibility_icon = "" if privacy_settings.get('current_role', True) else "🔒"
         st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Current Role {visibility_icon}</p>
-    <p style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{user_profile_data.get('current_role', 'N/A')}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Current Role {visibility_icon}</p>
+    <p class='title-md m-0'>{user_profile_data.get('current_role', 'N/A')}</p>
 </div>
 """, unsafe_allow_html=True)
 
         # Current Company
         visibility_icon = "" if privacy_settings.get('current_company', True) else "🔒"
         st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Current Company {visibility_icon}</p>
-    <p style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{user_profile_data.get('current_company', 'N/A')}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Current Company {visibility_icon}</p>
+    <p class='title-md m-0'>{user_profile_data.get('current_company', 'N/A')}</p>
 </div>
 """, unsafe_allow_html=True)
 
         # Industry
         visibility_icon = "" if privacy_settings.get('industry', True) else "🔒"
         st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Industry {visibility_icon}</p>
-    <p style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{user_profile_data.get('industry', 'N/A')}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Industry {visibility_icon}</p>
+    <p class='title-md m-0'>{user_profile_data.get('industry', 'N/A')}</p>
 </div>
 """, unsafe_allow_html=True)
 
@@ -2373,9 +2024,9 @@ def show_profile_page():
         if user_profile_data.get('company_stage'):
             visibility_icon = "" if privacy_settings.get('company_stage', True) else "🔒"
             st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Company Stage {visibility_icon}</p>
-    <p style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{user_profile_data.get('company_stage')}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Company Stage {visibility_icon}</p>
+    <p class='title-md m-0'>{user_profile_data.get('company_stage')}</p>
 </div>
 """, unsafe_allow_html=True)
 
@@ -2386,9 +2037,9 @@ def show_profile_page():
         if user_profile_data.get('location_country'):
             location_str += f", {user_profile_data.get('location_country')}"
         st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Location {visibility_icon_city}</p>
-    <p style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{location_str}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Location {visibility_icon_city}</p>
+    <p class='title-md m-0'>{location_str}</p>
 </div>
 """, unsafe_allow_html=True)
 
@@ -2400,8 +2051,8 @@ def show_profile_page():
             visibility_icon = "" if privacy_settings.get('goals', False) else "🔒"
             goals_str = ", ".join(goals) if goals else "None specified"
             st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Goals {visibility_icon}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Goals {visibility_icon}</p>
     <p style='font-size: 1rem; color: var(--text-primary); margin: 0;'>{goals_str}</p>
 </div>
 """, unsafe_allow_html=True)
@@ -2411,8 +2062,8 @@ def show_profile_page():
             visibility_icon = "" if privacy_settings.get('interests', True) else "🔒"
             interests_str = ", ".join(interests) if interests else "None specified"
             st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Interests {visibility_icon}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Interests {visibility_icon}</p>
     <p style='font-size: 1rem; color: var(--text-primary); margin: 0;'>{interests_str}</p>
 </div>
 """, unsafe_allow_html=True)
@@ -2422,14 +2073,14 @@ def show_profile_page():
             visibility_icon = "" if privacy_settings.get('seeking_connections', True) else "🔒"
             seeking_str = ", ".join(seeking_connections) if seeking_connections else "None specified"
             st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-    <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-1) 0;'>Seeking Connections {visibility_icon}</p>
+<div class='card card-compact'>
+    <p class='muted-sm m-0 mb-1'>Seeking Connections {visibility_icon}</p>
     <p style='font-size: 1rem; color: var(--text-primary); margin: 0;'>{seeking_str}</p>
 </div>
 """, unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary);'>🔒 = Private (not visible to others)</p>", unsafe_allow_html=True)
+        st.markdown("<p class='muted-sm'>🔒 = Private (not visible to others)</p>", unsafe_allow_html=True)
 
     else:
         # ============================================
@@ -2450,7 +2101,7 @@ def show_profile_page():
             with col1:
                 new_current_role = st.text_input("Current Role", value=user_profile_data.get('current_role', ''), help="Your job title")
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 role_visible = st.checkbox("Public", value=privacy_settings.get('current_role', True), key="privacy_role")
 
             # Current Company
@@ -2458,7 +2109,7 @@ def show_profile_page():
             with col1:
                 new_current_company = st.text_input("Current Company", value=user_profile_data.get('current_company', ''), help="Your company")
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 company_visible = st.checkbox("Public", value=privacy_settings.get('current_company', True), key="privacy_company")
 
             # Industry
@@ -2469,7 +2120,7 @@ def show_profile_page():
                     current_industry_index = user_profile.INDUSTRY_OPTIONS.index(user_profile_data.get('industry'))
                 new_industry = st.selectbox("Industry", options=user_profile.INDUSTRY_OPTIONS, index=current_industry_index)
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 industry_visible = st.checkbox("Public", value=privacy_settings.get('industry', True), key="privacy_industry")
 
             # Company Stage
@@ -2481,7 +2132,7 @@ def show_profile_page():
                     current_stage_index = all_stage_options.index(user_profile_data.get('company_stage'))
                 new_company_stage = st.selectbox("Company Stage (Optional)", options=all_stage_options, index=current_stage_index)
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 stage_visible = st.checkbox("Public", value=privacy_settings.get('company_stage', True), key="privacy_stage")
 
             # Location
@@ -2491,7 +2142,7 @@ def show_profile_page():
             with col2:
                 new_location_country = st.text_input("Country", value=user_profile_data.get('location_country', ''))
             with col3:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 location_visible = st.checkbox("Public", value=privacy_settings.get('location_city', True), key="privacy_location")
 
             st.markdown("<br>", unsafe_allow_html=True)
@@ -2502,7 +2153,7 @@ def show_profile_page():
             with col1:
                 new_goals = st.multiselect("Goals (Optional)", options=user_profile.GOAL_OPTIONS, default=goals)
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 goals_visible = st.checkbox("Public", value=privacy_settings.get('goals', False), key="privacy_goals")
 
             # Interests
@@ -2510,7 +2161,7 @@ def show_profile_page():
             with col1:
                 new_interests = st.multiselect("Interests (Optional)", options=user_profile.INTEREST_OPTIONS, default=interests)
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 interests_visible = st.checkbox("Public", value=privacy_settings.get('interests', True), key="privacy_interests")
 
             # Seeking Connections
@@ -2518,7 +2169,7 @@ def show_profile_page():
             with col1:
                 new_seeking_connections = st.multiselect("Seeking Connections (Optional)", options=user_profile.CONNECTION_TYPE_OPTIONS, default=seeking_connections)
             with col2:
-                st.markdown("<p style='font-size: 0.875rem; color: var(--text-tertiary); margin-top: 2rem;'>Visibility</p>", unsafe_allow_html=True)
+                st.markdown("<p class='muted-sm mt-8'>Visibility</p>", unsafe_allow_html=True)
                 seeking_visible = st.checkbox("Public", value=privacy_settings.get('seeking_connections', True), key="privacy_seeking")
 
             st.markdown("<br>", unsafe_allow_html=True)
@@ -2613,7 +2264,7 @@ def show_connections_page():
     with tabs[0]:
         st.markdown("<br>", unsafe_allow_html=True)
 
-        connections = collaboration.get_user_connections(user_id, status='accepted')
+        connections = get_cached_user_connections(user_id, status='accepted')
 
         if not connections:
             # Empty state
@@ -2651,12 +2302,12 @@ def show_connections_page():
                     safe_email = sanitize_html(conn['email'])
 
                     st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-<h3 style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0 0 var(--space-2) 0;'>{safe_full_name}</h3>
-<p style='font-size: 0.9375rem; color: var(--text-secondary); margin: 0 0 var(--space-1) 0;'>{safe_organization}</p>
-<p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-3) 0;'>{safe_email}</p>
+<div class='card card-compact'>
+<h3 class='title-md m-0 mb-2'>{safe_full_name}</h3>
+<p class='body-sm m-0 mb-1'>{safe_organization}</p>
+<p class='muted-sm m-0 mb-3'>{safe_email}</p>
 <div style='display: flex; gap: var(--space-4); align-items: center;'>
-<span style='font-size: 0.875rem; color: var(--text-tertiary);'>{contact_count:,} contacts</span>
+<span class='muted-sm'>{contact_count:,} contacts</span>
 <span style='font-size: 0.875rem; color: {sharing_color};'>{sharing_badge}</span>
 </div>
 </div>
@@ -2675,6 +2326,8 @@ def show_connections_page():
                     if new_sharing != conn['network_sharing_enabled']:
                         result = collaboration.update_network_sharing(conn['connection_id'], new_sharing, user_id)
                         if result['success']:
+                            get_cached_user_connections.clear()
+                            get_extended_network_contacts.clear()
                             st.success("Updated")
                             st.rerun()
 
@@ -2734,11 +2387,11 @@ def show_connections_page():
                         safe_result_email = sanitize_html(result['email'])
 
                         st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-<h3 style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0 0 var(--space-2) 0;'>{safe_result_name}</h3>
-<p style='font-size: 0.9375rem; color: var(--text-secondary); margin: 0 0 var(--space-1) 0;'>{safe_result_org}</p>
-<p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-3) 0;'>{safe_result_email}</p>
-<span style='font-size: 0.875rem; color: var(--text-tertiary);'>{contact_count:,} contacts</span>
+<div class='card card-compact'>
+<h3 class='title-md m-0 mb-2'>{safe_result_name}</h3>
+<p class='body-sm m-0 mb-1'>{safe_result_org}</p>
+<p class='muted-sm m-0 mb-3'>{safe_result_email}</p>
+<span class='muted-sm'>{contact_count:,} contacts</span>
 </div>
 """, unsafe_allow_html=True)
 
@@ -2815,11 +2468,11 @@ def show_connections_page():
 
                 # Request card
                 st.markdown(f"""
-<div class='card' style='padding: var(--space-5); margin-bottom: var(--space-4);'>
-<h3 style='font-size: 1.125rem; font-weight: 600; color: var(--text-primary); margin: 0 0 var(--space-2) 0;'>{req['requester_name']} wants to connect</h3>
-<p style='font-size: 0.9375rem; color: var(--text-secondary); margin: 0 0 var(--space-1) 0;'>{req.get('requester_organization', 'No organization')}</p>
-<p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 var(--space-3) 0;'>{req['requester_email']}</p>
-<span style='font-size: 0.875rem; color: var(--text-tertiary);'>{contact_count:,} contacts</span>
+<div class='card card-compact'>
+<h3 class='title-md m-0 mb-2'>{req['requester_name']} wants to connect</h3>
+<p class='body-sm m-0 mb-1'>{req.get('requester_organization', 'No organization')}</p>
+<p class='muted-sm m-0 mb-3'>{req['requester_email']}</p>
+<span class='muted-sm'>{contact_count:,} contacts</span>
 </div>
 """, unsafe_allow_html=True)
 
@@ -2865,6 +2518,8 @@ def show_connections_page():
                                 result = collaboration.accept_connection_request(req['connection_id'], share_network)
 
                                 if result['success']:
+                                    get_cached_user_connections.clear()
+                                    get_extended_network_contacts.clear()
                                     st.success(result['message'])
                                     st.session_state[f'show_accept_modal_{req["connection_id"]}'] = False
                                     st.rerun()
@@ -3084,47 +2739,758 @@ def show_profile_onboarding(user_id: str):
             label_visibility="collapsed"
         )
 
-        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        # Submit button
+        st.markdown("<br>", unsafe_allow_html=True)
+        submitted = st.form_submit_button("Complete Profile", use_container_width=True, type="primary")
+
+        if submitted:
+            # === SECURITY: Validate CSRF token ===
+            token_result = validate_csrf_token_detailed('profile_onboarding', st.session_state.get('profile_onboarding_csrf_token', ''))
+
+            if not token_result['valid']:
+                st.error(token_result['message'])
+                log_csrf_failure('profile_onboarding', user_id, token_result['reason'])
+                st.stop()
+
+            # Validate required fields
+            if not current_role or not current_company or not location_city:
+                st.error("Please fill in all required fields (Role, Company, Industry, and City)")
+            else:
+                # Create profile
+                result = user_profile.create_profile(
+                    user_id=user_id,
+                    current_role=current_role,
+                    current_company=current_company,
+                    industry=industry,
+                    location_city=location_city,
+                    company_stage=company_stage if company_stage else None,
+                    location_country=location_country if location_country else None,
+                    goals=goals if goals else [],
+                    interests=interests if interests else [],
+                    seeking_connections=seeking_connections if seeking_connections else []
+                )
+
+                if result['success']:
+                    st.success("Profile created! Loading your dashboard...")
+                    st.rerun()
+                else:
+                    st.error(f"Failed to create profile: {result['message']}")
+
+
+# Main app
+# Contact card markup. Styling lives in static/app.css, so only the per-contact
+# values are filled in for each card.
+CONTACT_CARD_TEMPLATE = (
+    "<div class='contact-card'><div class='contact-card-body'>"
+    "<div class='contact-avatar'>{avatar_initial}</div>"
+    "<div class='contact-card-main'>"
+    "<div class='contact-name'>{name}</div>"
+    "<div class='contact-position'>{position}</div>"
+    "<div class='contact-info-row'><span class='contact-company'>{company}</span>{email_badge}</div>"
+    "{match_explanation}"
+    "</div></div></div>"
+)
+EXTENDED_CARD_TEMPLATE = (
+    "<div class='extended-contact-card'>"
+    "<div class='contact-name'>{name}</div>"
+    "<div class='contact-position'>{position}</div>"
+    "<div class='contact-company'>🏢 {company}</div>"
+    "<div class='extended-badge'>In {owner}'s network</div>"
+    "</div>"
+)
+MATCH_REASON_TEMPLATE = "<div class='match-reason'><span class='match-reason-icon'>✓</span><span>{reason}</span></div>"
+
+def build_contact_card_html(name, job_position, company, email, query_words):
+    """HTML for one My Network contact card (values already stripped, with display fallbacks applied)"""
+    # === SECURITY: Sanitize all user-generated content to prevent XSS ===
+    safe_name = sanitize_html(name)
+    safe_position = sanitize_html(job_position)
+    safe_company = sanitize_html(company)
+    safe_email = sanitize_html(email) if email else ''
+
+    # Build match explanation if we have query context
+    match_explanation = ""
+    if query_words:
+        reasons = []
+
+        # Check for company match
+        if company and company != 'No Company':
+            if any(word in company.lower() for word in query_words):
+                reasons.append(MATCH_REASON_TEMPLATE.format(reason=f"Company: <strong>{safe_company}</strong>"))
+
+        # Check for position match
+        if job_position and job_position != 'No Position':
+            if any(word in job_position.lower() for word in query_words):
+                reasons.append(MATCH_REASON_TEMPLATE.format(reason=f"Position: <strong>{safe_position}</strong>"))
+
+        # Check for name match
+        if name and name != 'No Name':
+            if any(word in name.lower() for word in query_words):
+                reasons.append(MATCH_REASON_TEMPLATE.format(reason="Name match"))
+
+        if reasons:
+            match_explanation = f"<div class='match-explanation'><div class='match-explanation-title'>Why this match</div>{''.join(reasons)}</div>"
+
+    return CONTACT_CARD_TEMPLATE.format_map({
+        'avatar_initial': name[0].upper() if name and name != 'No Name' else '?',
+        'name': safe_name,
+        'position': safe_position,
+        'company': safe_company,
+        'email_badge': f"<span class='contact-email'>{safe_email}</span>" if email else "",
+        'match_explanation': match_explanation,
+    })
+
+# Contact card fields, in the order build_contact_card_html takes them, with the text
+# shown when a field is empty
+CARD_FIELD_FALLBACKS = {'full_name': 'No Name', 'position': 'No Position', 'company': 'No Company', 'email': ''}
+
+def build_extended_card_html(row):
+    """HTML for one Extended Network contact card (row is a contact record dict)"""
+    # === SECURITY: Sanitize extended network contact data ===
+    return EXTENDED_CARD_TEMPLATE.format_map({
+        'name': sanitize_html(row.get('full_name', 'No Name')),
+        'position': sanitize_html(row.get('position', 'No Position')),
+        'company': sanitize_html(row.get('company', 'No Company')),
+        'owner': sanitize_html(row.get('owner_name', 'Unknown')),
+    })
+
+# Result columns shown in exports, in this order, when present
+RESULT_DISPLAY_COLUMNS = ['full_name', 'position', 'company', 'email']
+
+def get_display_cols(filtered_df):
+    """RESULT_DISPLAY_COLUMNS present in filtered_df, cached in session state per results frame"""
+    cached = st.session_state.get('_display_cols')
+    if cached is None or cached['frame'] is not filtered_df:
+        cached = {
+            'frame': filtered_df,
+            'cols': [col for col in RESULT_DISPLAY_COLUMNS if col in filtered_df.columns]
+        }
+        st.session_state['_display_cols'] = cached
+    return cached['cols']
+
+CONTACTS_PER_PAGE = 10
+
+def get_pagination(filtered_df):
+    """Pagination state for a results frame; a new frame (i.e. a new search) starts on page 1"""
+    pagination = st.session_state.get('pagination')
+    if pagination is None or pagination['frame'] is not filtered_df:
+        total = len(filtered_df)
+        pagination = {
+            'frame': filtered_df,
+            'total': total,
+            'per_page': CONTACTS_PER_PAGE,
+            'total_pages': -(-total // CONTACTS_PER_PAGE),  # Ceiling division
+            'current_page': 1
+        }
+        st.session_state['pagination'] = pagination
+    return pagination
+
+def get_selection_mask(filtered_df):
+    """
+    Boolean mask over filtered_df's rows marking the selected contacts
+
+    Kept in session state next to the frame it belongs to, so a new set of search
+    results starts with a fresh, correctly sized mask. 'gen' counts result sets and
+    keys the table view's data editor, so its edits never carry over to new results.
+    """
+    selection = st.session_state.get('contact_selection')
+    if selection is None or selection['frame'] is not filtered_df:
+        selection = {
+            'frame': filtered_df,
+            'mask': np.zeros(len(filtered_df), dtype=bool),
+            'gen': selection['gen'] + 1 if selection is not None else 0
+        }
+        st.session_state['contact_selection'] = selection
+    return selection['mask']
+
+def sync_page_selection(selection_key, page_indices):
+    """on_change callback: apply the page's contact multiselect to the selection mask"""
+    selected_mask = st.session_state['contact_selection']['mask']
+    selected_mask[page_indices] = False
+    selected_mask[st.session_state[selection_key]] = True
+
+def get_export_files(filtered_df, display_cols):
+    """CSV and TXT bytes for 'Export All Results', cached in session state per results frame"""
+    cached = st.session_state.get('_export_files')
+    if cached is None or cached['frame'] is not filtered_df or cached['cols'] != display_cols:
+        # Write straight to bytes so Streamlit doesn't re-encode the whole payload
+        csv_buffer = BytesIO()
+        filtered_df[display_cols].to_csv(csv_buffer, index=False, encoding='utf-8')
+
+        # Join the three columns with numpy's vectorized string ops instead of a per-row f-string
+        text_cols = filtered_df.reindex(columns=['full_name', 'position', 'company'], fill_value='').fillna('')
+        names = text_cols['full_name'].to_numpy(dtype=str)
+        positions = text_cols['position'].to_numpy(dtype=str)
+        companies = text_cols['company'].to_numpy(dtype=str)
+        lines = np.char.add(np.char.add(np.char.add(np.char.add(names, ' - '), positions), ' at '), companies)
+
+        cached = {
+            'frame': filtered_df,
+            'cols': list(display_cols),
+            'csv': csv_buffer.getvalue(),
+            'txt': "\n".join(lines.tolist()).encode('utf-8')
+        }
+        st.session_state['_export_files'] = cached
+    return cached
+
+def get_selected_contacts(filtered_df, selected_mask):
+    """
+    The selected rows of filtered_df, cached in session state per results frame and selection
+
+    Shared by the action buttons and the 'Export Selected' CSV, so the rows are only
+    gathered again when the results or the selection actually change.
+    """
+    cached = st.session_state.get('_selected_contacts')
+    if cached is None or cached['frame'] is not filtered_df or not np.array_equal(cached['mask'], selected_mask):
+        cached = {
+            'frame': filtered_df,
+            'mask': selected_mask.copy(),
+            'df': filtered_df.iloc[np.flatnonzero(selected_mask)],
+            'csv': {}  # tuple(display_cols) -> CSV bytes
+        }
+        st.session_state['_selected_contacts'] = cached
+    return cached
+
+def get_selected_csv(filtered_df, selected_mask, display_cols):
+    """CSV bytes of the selected contacts, re-serialized only when the frame or selection changes"""
+    selection = get_selected_contacts(filtered_df, selected_mask)
+    cols_key = tuple(display_cols)
+    if cols_key not in selection['csv']:
+        csv_buffer = BytesIO()
+        selection['df'][display_cols].to_csv(csv_buffer, index=False, encoding='utf-8')
+        selection['csv'][cols_key] = csv_buffer.getvalue()
+    return selection['csv'][cols_key]
+
+def go_to_picked_page(pagination):
+    """on_change callback: move the results pagination to the page chosen in the page picker"""
+    pagination['current_page'] = st.session_state['page_picker']
+
+def save_email_draft_edit(draft_idx, text_key):
+    """on_change callback: keep a user's edits to an email draft in the stored drafts"""
+    st.session_state['email_drafts'][draft_idx]['email_text'] = st.session_state[text_key]
+
+def reset_email_draft_widgets():
+    """
+    Drop the draft picker's and draft text areas' widget state
+
+    A keyed text area keeps its text even when its value= changes, so without this
+    a new batch of drafts would show (and save back) the previous batch's text.
+    """
+    for key in [key for key in st.session_state if key.startswith('email_text_')]:
+        del st.session_state[key]
+    st.session_state.pop('active_email_tab', None)
+
+@st.fragment
+def render_export_panel(filtered_df, display_cols):
+    """Render the 'Export All Results' download buttons.
+
+    Runs as a fragment so interactions elsewhere on the page (email draft tabs,
+    selection checkboxes) don't re-run it; the payloads themselves are cached per
+    results frame by get_export_files().
+    """
+    export_files = get_export_files(filtered_df, display_cols)
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.download_button(
+            label="Download All as CSV",
+            data=export_files['csv'],
+            file_name="all_contacts.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+    with col2:
+        st.download_button(
+            label="Download All as TXT",
+            data=export_files['txt'],
+            file_name="all_contacts.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+
+@st.fragment
+def render_results_list(filtered_df, query, user_id):
+    """Render the search results list: cards or table, pagination, selection and actions.
+
+    Runs as a fragment, so paging, selecting contacts and switching email drafts only
+    re-run this block, not the whole page (header, data loading, search form).
+    """
+    # Check which networks were searched
+    search_my = st.session_state.get('search_my_network', True)
+    search_extended = st.session_state.get('search_extended_network', False)
+    searching_both = search_my and search_extended
+    searching_only_extended = search_extended and not search_my
+
+    # Pagination setup (computed once per set of results, which start on page 1)
+    pagination = get_pagination(filtered_df)
+    contacts_per_page = pagination['per_page']
+    total_contacts = pagination['total']
+    total_pages = pagination['total_pages']
+    current_page = pagination['current_page']
+
+    # Header - always show selection controls since results may contain mixed sources
+    if searching_both:
+        results_title = "Results from Both Networks"
+    elif searching_only_extended:
+        results_title = "Results from Extended Network"
+    else:
+        results_title = "Select Contacts"
+
+    # Table view shows every result in one scrollable grid instead of pages of cards.
+    # Only offered for My Network results - extended contacts need their intro button.
+    has_extended_results = (
+        'owner_user_id' in filtered_df.columns and filtered_df['owner_user_id'].notna().any()
+    )
+
+    # Title and page indicator are static, so they share one element; only the
+    # select-all checkbox and view toggle need their own column
+    col_header_text, col_header_select = st.columns([3, 1])
+    with col_header_select:
+        table_view = False
+        if search_my and not has_extended_results:
+            table_view = st.toggle("Table view", key="results_table_view")
+        if search_my:  # Only show select all if my network is included
+            select_all_page = st.checkbox(
+                "Select All" if table_view else "Select All on Page",
+                key="select_all_page_checkbox"
+            )
+        else:
+            select_all_page = False
+    with col_header_text:
+        position_text = f"{total_contacts} contacts" if table_view else f"Page {current_page} of {total_pages}"
+        st.markdown(f"""
+<div style='display: flex; justify-content: space-between; align-items: baseline; gap: 1rem;'>
+    <h3 style='margin: 0;'>{results_title}</h3>
+    <div style='padding-top: 0.5rem; color: #666;'>{position_text}</div>
+</div>
+""", unsafe_allow_html=True)
+
+    # Calculate pagination slice (the table view's "page" is every result)
+    if table_view:
+        start_idx, end_idx = 0, total_contacts
+    else:
+        start_idx = (current_page - 1) * contacts_per_page
+        end_idx = min(start_idx + contacts_per_page, total_contacts)
+
+    # Get contacts for current page
+    page_contacts = filtered_df.iloc[start_idx:end_idx]
+
+    # Columns used for exports (worked out once per set of results)
+    display_cols = get_display_cols(filtered_df)
+
+    # Selected contacts, as a boolean mask over filtered_df's rows
+    selected_mask = get_selection_mask(filtered_df)
+    table_editor_key = f"contact_table_editor_{st.session_state['contact_selection']['gen']}"
+
+    # Extended network contacts have an owner_user_id; My Network contacts don't
+    if 'owner_user_id' in page_contacts.columns:
+        page_is_extended = page_contacts['owner_user_id'].notna().to_numpy()
+    else:
+        page_is_extended = np.zeros(len(page_contacts), dtype=bool)
+
+    # Positions (in filtered_df) of the My Network contacts on this page
+    my_network_indices = start_idx + np.flatnonzero(~page_is_extended)
+
+    # Handle select all on page (only if my network is included). Whenever this
+    # rewrites the mask, the table editor's pending edits are dropped so they
+    # can't override it.
+    if search_my and select_all_page:
+        # Only add My Network contacts (those without owner_user_id)
+        if not selected_mask[my_network_indices].all():
+            selected_mask[my_network_indices] = True
+            st.session_state.pop(table_editor_key, None)
+    elif search_my and not select_all_page:
+        # Check if all My Network contacts on current page are selected, if so deselect
+        if len(my_network_indices) and selected_mask[my_network_indices].all():
+            selected_mask[my_network_indices] = False
+            st.session_state.pop(table_editor_key, None)
+
+    if table_view:
+        # One Arrow-backed, virtualized st.data_editor for all results; its Select
+        # column reads from and writes back to the selection mask
+        table_df = filtered_df[display_cols]
+        table_df.insert(0, 'Select', selected_mask.copy())
+        edited_df = st.data_editor(
+            table_df,
+            hide_index=True,
+            use_container_width=True,
+            disabled=display_cols,
+            column_config={
+                'Select': st.column_config.CheckboxColumn("Select", width="small"),
+                'full_name': "Name",
+                'position': "Position",
+                'company': "Company",
+                'email': "Email"
+            },
+            key=table_editor_key
+        )
+        selected_mask[:] = edited_df['Select'].to_numpy(dtype=bool)
+    else:
+        # Display each contact card. All cards on the page are sent as one markdown
+        # element, with a single selection widget for My Network contacts and a single
+        # intro picker for Extended Network contacts (instead of widgets per card).
+        query_words = query.lower().split() if query and query.strip() else []
+        page_cards = []
+        page_selectable = {}  # actual_idx -> name, for the page's selection widget
+        page_extended = {}  # actual_idx -> contact record, for the intro picker
+
+        # Card fields for the whole page, cleaned column-wise: missing columns/values
+        # become '', text is stripped, and empty fields get their display fallback
+        card_fields = page_contacts.reindex(columns=CARD_FIELD_FALLBACKS, fill_value='').fillna('').astype(str)
+        for col, fallback in CARD_FIELD_FALLBACKS.items():
+            card_fields[col] = card_fields[col].str.strip()
+            if fallback:
+                card_fields[col] = card_fields[col].mask(card_fields[col] == '', fallback)
+
+        # Extended Network rows also need their owner fields for the intro request
+        extended_records = dict(zip(
+            np.flatnonzero(page_is_extended).tolist(),
+            page_contacts[page_is_extended].to_dict('records')
+        ))
+
+        # Plain tuples (no per-row Series or dict lookups)
+        for page_idx, (name, job_position, company, email) in enumerate(card_fields.itertuples(index=False, name=None)):
+            # Actual index in the full filtered_df
+            actual_idx = start_idx + page_idx
+
+            if page_is_extended[page_idx]:
+                # Extended Network: card plus an entry in the page's intro picker
+                row = extended_records[page_idx]
+                page_cards.append(build_extended_card_html(row))
+                page_extended[actual_idx] = row
+            else:
+                # My Network: card plus an entry in the page's selection widget
+                page_cards.append(build_contact_card_html(name, job_position, company, email, query_words))
+                page_selectable[actual_idx] = name
+
+        if page_cards:
+            st.markdown(''.join(page_cards), unsafe_allow_html=True)
+
+        # One intro picker for the page's Extended Network contacts
+        if page_extended:
+            col_intro_pick, col_intro_button = st.columns([3, 1])
+            with col_intro_pick:
+                intro_idx = st.selectbox(
+                    "Request an intro to",
+                    options=list(page_extended),
+                    format_func=lambda i: f"{page_extended[i].get('full_name', 'No Name')} (via {page_extended[i].get('owner_name', 'Unknown')})",
+                    key=f"intro_pick_{current_page}"
+                )
+            with col_intro_button:
+                st.markdown("<br>", unsafe_allow_html=True)
+                if st.button("Request Intro", key=f"req_intro_{current_page}", use_container_width=True):
+                    row = page_extended[intro_idx]
+                    # Store contact info in session state to show request form
+                    st.session_state['intro_request_contact'] = {
+                        'contact_id': row.get('id'),
+                        'target_name': row.get('full_name', ''),
+                        'target_company': row.get('company', ''),
+                        'target_position': row.get('position', ''),
+                        'target_email': row.get('email', ''),
+                        'connector_id': row.get('owner_user_id'),
+                        'connector_name': row.get('owner_name'),
+                        'connector_email': row.get('owner_email')
+                    }
+                    st.rerun()
+
+        # One selection widget for the page's My Network contacts (instead of a checkbox per card)
+        if page_selectable:
+            selection_key = f"page_selection_{current_page}"
+            st.session_state[selection_key] = [i for i in page_selectable if selected_mask[i]]
+            st.multiselect(
+                "Select contacts on this page",
+                options=list(page_selectable),
+                format_func=page_selectable.get,
+                key=selection_key,
+                on_change=sync_page_selection,
+                args=(selection_key, list(page_selectable)),
+                placeholder="Choose contacts to email or export"
+            )
+
+    # Pagination controls - Notion style
+    if total_pages > 1 and not table_view:
+        st.markdown('<div style="margin-top: var(--space-8); margin-bottom: var(--space-6);"></div>', unsafe_allow_html=True)
+        col_prev, col_pages, col_next = st.columns([1, 3, 1])
+
+        with col_prev:
+            if st.button("← Previous", disabled=(current_page == 1), use_container_width=True, type="secondary"):
+                pagination['current_page'] = max(1, current_page - 1)
+                st.rerun(scope="fragment")
+
+        with col_pages:
+            # Show page numbers as one radio widget (instead of a button per page);
+            # its callback moves the page before the rerun, so no st.rerun() here
+            pages_to_show = {1, max(1, current_page - 1), current_page, min(total_pages, current_page + 1), total_pages}
+            pages_to_show = sorted(pages_to_show)
+
+            st.session_state['page_picker'] = current_page
+            st.radio(
+                "Page",
+                options=pages_to_show,
+                horizontal=True,
+                label_visibility="collapsed",
+                key="page_picker",
+                on_change=go_to_picked_page,
+                args=(pagination,)
+            )
+
+        with col_next:
+            if st.button("Next →", disabled=(current_page == total_pages), use_container_width=True, type="secondary"):
+                pagination['current_page'] = min(total_pages, current_page + 1)
+                st.rerun(scope="fragment")
+
+        st.markdown(f"<div style='text-align: center; color: var(--text-tertiary); margin-top: var(--space-4); font-size: 0.9375rem;'>Showing {start_idx + 1}-{end_idx} of {total_contacts} contacts</div>", unsafe_allow_html=True)
+
+    # Show intro request form if extended network contact selected
+    if 'intro_request_contact' in st.session_state:
+        contact = st.session_state['intro_request_contact']
+
+        st.markdown("---")
+        st.markdown("### Request Introduction")
+
+        st.markdown(f"""
+        <div style='background: #fffbeb; padding: 1.5rem; border-radius: 10px; border: 1px solid #fbbf24; margin-bottom: 1.5rem;'>
+            <div style='font-weight: 600; font-size: 1rem; color: #1a1a1a; margin-bottom: 0.5rem;'>
+                Requesting intro to: <span style='color: #3b82f6;'>{contact['target_name']}</span>
+            </div>
+            <div style='color: #666; font-size: 0.9rem; margin-bottom: 0.3rem;'>
+                {contact['target_position']} at {contact['target_company']}
+            </div>
+            <div style='color: #999; font-size: 0.85rem;'>
+                Via: {contact['connector_name']} ({contact['connector_email']})
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        with st.form("intro_request_form"):
+            request_message = st.text_area(
+                "Why do you want to meet this person? *",
+                placeholder="e.g., I'm raising a seed round for my fintech startup and would love to get Sarah's advice on product-market fit...",
+                height=150,
+                help="This will be shown to the person you want to meet"
+            )
+
+            context_for_connector = st.text_area(
+                "Additional context for your connection (optional)",
+                placeholder="e.g., We met at the Tech Conference 2024. Remember we talked about my startup idea?",
+                height=100,
+                help="Private message to help your connection make the intro"
+            )
+
+            col1, col2 = st.columns(2)
+            with col1:
+                submit_request = st.form_submit_button("Send Request", type="primary", use_container_width=True)
+            with col2:
+                cancel_request = st.form_submit_button("Cancel", use_container_width=True)
+
+            if submit_request:
+                if not request_message.strip():
+                    st.error("Please explain why you want this introduction")
+                else:
+                    # Create intro request
+                    result = collaboration.create_intro_request(
+                        requester_id=user_id,
+                        connector_id=contact['connector_id'],
+                        target_contact_id=contact['contact_id'],
+                        target_name=contact['target_name'],
+                        target_company=contact['target_company'],
+                        target_position=contact['target_position'],
+                        target_email=contact['target_email'],
+                        request_message=request_message.strip(),
+                        context_for_connector=context_for_connector.strip() if context_for_connector.strip() else None
+                    )
+
+                    if result['success']:
+                        st.success(f"Introduction request sent to {contact['connector_name']}!")
+                        del st.session_state['intro_request_contact']
+                        st.rerun()
+                    else:
+                        st.error(result['message'])
+
+            if cancel_request:
+                del st.session_state['intro_request_contact']
+                st.rerun()
+
+    # Action buttons for selected contacts (My Network contacts only)
+    # Only show if we searched My Network and have selections
+    selected_count = int(np.count_nonzero(selected_mask))
+    if search_my and selected_count > 0:
+        st.markdown(f"<p class='mt-6 mb-6'><strong>{selected_count} contact(s) selected</strong></p>", unsafe_allow_html=True)
+
+        # Email customization options
+
+        col_purpose, col_tone = st.columns(2)
+
+        with col_purpose:
+            email_purpose = st.selectbox(
+                "What's the purpose of your email?",
+                [
+                    "Just catching up / Reconnecting",
+                    "I'm looking for a job",
+                    "I'm looking to hire",
+                    "Pitching my startup/idea",
+                    "Asking for advice/mentorship",
+                    "Making an introduction",
+                    "Requesting a coffee chat",
+                    "Seeking information/insights"
+                ],
+                key="email_purpose_selector"
+            )
+
+        with col_tone:
+            email_tone = st.selectbox(
+                "What tone should the email have?",
+                [
+                    "Friendly & Casual",
+                    "Professional & Formal",
+                    "Enthusiastic & Energetic",
+                    "Direct & Brief",
+                    "Humble & Respectful"
+                ],
+                key="email_tone_selector"
+            )
 
-        # Submit button
+        # Additional context text area
         st.markdown("<br>", unsafe_allow_html=True)
-        submitted = st.form_submit_button("Complete Profile", use_container_width=True, type="primary")
+        additional_context = st.text_area(
+            "Additional context (optional)",
+            placeholder="e.g., 'We met at the Tech Conference 2023' or 'They mentored me during my internship' or 'We worked together on Project X'",
+            help="Add any personal context about your relationship or what you know about these connections. This helps create more authentic emails.",
+            height=100,
+            key="additional_context_input"
+        )
 
-        if submitted:
-            # === SECURITY: Validate CSRF token ===
-            token_result = validate_csrf_token_detailed('profile_onboarding', st.session_state.get('profile_onboarding_csrf_token', ''))
+        # Action buttons
+        col1, col2, col3 = st.columns(3)
 
-            if not token_result['valid']:
-                st.error(token_result['message'])
-                log_csrf_failure('profile_onboarding', user_id, token_result['reason'])
-                st.stop()
+        with col1:
+            if st.button("Generate Personalized Emails", use_container_width=True, type="primary"):
+                # Get selected contacts by position
+                selected_df = get_selected_contacts(filtered_df, selected_mask)['df']
+
+                # Generate personalized emails with loading spinner
+                with st.spinner(f"AI is writing {len(selected_df)} personalized email(s)..."):
+                    try:
+                        email_drafts = generate_personalized_emails(selected_df, email_purpose, email_tone, additional_context)
+                        st.session_state['email_drafts'] = email_drafts
+                        # Start on the first contact's email, with no text left over from earlier drafts
+                        reset_email_draft_widgets()
+
+                        # Log successful email generation
+                        log_analytics(
+                            'log_email_generation',
+                            num_contacts=len(selected_df),
+                            email_purpose=email_purpose,
+                            email_tone=email_tone,
+                            success=True,
+                            session_id=st.session_state['session_id']
+                        )
+                        st.success(f"Generated {len(selected_df)} personalized email draft(s)!")
+                    except Exception as e:
+                        # Log failed email generation
+                        log_analytics(
+                            'log_email_generation',
+                            num_contacts=len(selected_df),
+                            email_purpose=email_purpose,
+                            email_tone=email_tone,
+                            success=False,
+                            session_id=st.session_state['session_id']
+                        )
+                        st.error(f"Failed to generate emails: {str(e)}")
 
-            # Validate required fields
-            if not current_role or not current_company or not location_city:
-                st.error("Please fill in all required fields (Role, Company, Industry, and City)")
-            else:
-                # Create profile
-                result = user_profile.create_profile(
-                    user_id=user_id,
-                    current_role=current_role,
-                    current_company=current_company,
-                    industry=industry,
-                    location_city=location_city,
-                    company_stage=company_stage if company_stage else None,
-                    location_country=location_country if location_country else None,
-                    goals=goals if goals else [],
-                    interests=interests if interests else [],
-                    seeking_connections=seeking_connections if seeking_connections else []
+        with col2:
+            if st.button("Copy Contact Info", use_container_width=True):
+                selected_df = get_selected_contacts(filtered_df, selected_mask)['df']
+                # Column-wise string concatenation instead of building a Series per row
+                info_cols = selected_df.reindex(columns=['full_name', 'position', 'company'], fill_value='').fillna('').astype(str)
+                emails = selected_df.reindex(columns=['email'], fill_value='No email')['email'].fillna('No email').astype(str)
+                contact_info = (
+                    info_cols['full_name'] + ' - ' + info_cols['position'] + ' at ' + info_cols['company'] + ' (' + emails + ')'
+                ).str.cat(sep='\n')
+                st.session_state['contact_info'] = contact_info
+
+                # Log export
+                log_analytics(
+                    'log_contact_export',
+                    export_type="contact_info",
+                    num_contacts=len(selected_df),
+                    session_id=st.session_state['session_id']
                 )
 
-                if result['success']:
-                    st.success("Profile created! Loading your dashboard...")
-                    st.rerun()
-                else:
-                    st.error(f"Failed to create profile: {result['message']}")
+                st.success("Contact info copied! Check below.")
 
+        with col3:
+            # CSV export of selected
+            st.download_button(
+                label="Export Selected",
+                data=get_selected_csv(filtered_df, selected_mask, display_cols),
+                file_name="selected_contacts.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
+    # Display generated email drafts with tabs
+    if 'email_drafts' in st.session_state and st.session_state['email_drafts']:
+        st.markdown("<br>\n\n### Email Drafts", unsafe_allow_html=True)
+
+        email_drafts = st.session_state['email_drafts']
+
+        # One draft is rendered at a time: a radio picks the contact, so only the
+        # selected draft's text area is built and sent (tabs render every body)
+        active_idx = 0
+        if len(email_drafts) > 1:
+            if st.session_state.get('active_email_tab', 0) >= len(email_drafts):
+                st.session_state.pop('active_email_tab', None)
+            active_idx = st.radio(
+                "Email draft for",
+                options=range(len(email_drafts)),
+                format_func=lambda i: email_drafts[i]['name'],
+                horizontal=True,
+                label_visibility="collapsed",
+                key="active_email_tab"
+            )
+
+        draft = email_drafts[active_idx]
+        st.markdown(draft.get('envelope_html') or build_email_envelope_html(draft), unsafe_allow_html=True)
+
+        # Edits are written back to the draft, since the text area of a draft
+        # that isn't shown is dropped (with its widget state) on the next run
+        text_key = f"email_text_{active_idx}"
+        st.text_area(
+            "Email draft:",
+            value=draft['email_text'],
+            height=350,
+            key=text_key,
+            label_visibility="collapsed",
+            on_change=save_email_draft_edit,
+            args=(active_idx, text_key)
+        )
+
+        if draft.get('error'):
+            st.error("There was an error generating this email. Please check your OpenAI API settings.")
+        else:
+            st.info("AI-generated draft - please personalize before sending!")
+
+        if st.button("Clear All Email Drafts"):
+            st.session_state.pop('email_drafts', None)
+            reset_email_draft_widgets()
+            st.rerun()
+
+    # Display copied contact info
+    if 'contact_info' in st.session_state:
+        st.markdown("<br>\n\n### Contact Information", unsafe_allow_html=True)
+        st.code(st.session_state['contact_info'], language="text")
+        if st.button("Clear Contact Info"):
+            st.session_state.pop('contact_info', None)
+            st.rerun()
+
+    # Export all functionality (moved to bottom)
+    st.markdown("<br>\n\n---\n\n**Export All Results:**", unsafe_allow_html=True)
+    render_export_panel(filtered_df, display_cols)
 
-# Main app
 def main():
     # Handle URL parameters for password reset and email verification
     query_params = st.query_params
@@ -3200,45 +3566,6 @@ def main():
     # ============================================
     # RENDER PROFESSIONAL HEADER BAR
     # ============================================
-    # Header CSS
-    st.markdown("""
-<style>
-.header-container {
-    background: white;
-    padding: 1rem 2rem;
-    border-bottom: 1px solid #e5e7eb;
-    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);
-    margin: -1rem -1rem 0 -1rem;
-}
-
-.header-title {
-    font-size: 1.5rem;
-    font-weight: 700;
-    color: #1a1a1a;
-    margin: 0;
-    line-height: 2.5rem;
-    white-space: nowrap;
-    display: inline-block;
-    vertical-align: middle;
-}
-
-.header-button {
-    background: transparent;
-    border: none;
-    color: #6b7280;
-    font-size: 0.9375rem;
-    font-weight: 500;
-    padding: 0.5rem 1rem;
-    cursor: pointer;
-    transition: color 0.15s;
-    line-height: 2.5rem;
-}
-
-.header-button:hover {
-    color: #2563eb;
-}
-</style>
-""", unsafe_allow_html=True)
 
     if st.session_state.get('authenticated'):
         # Authenticated user navigation
@@ -3253,7 +3580,7 @@ def main():
             pending_requests_count = len(pending_requests_list)
 
         # Get contact count
-        contact_count = auth.get_contact_count(user_id)
+        contact_count = get_cached_contact_count(user_id)
 
         # Clean header with logo left, buttons right
         header_cols = st.columns([3, 5, 1, 1, 1])
@@ -3265,17 +3592,18 @@ def main():
 
         with header_cols[2]:
             st.markdown('<div class="text-link-button">', unsafe_allow_html=True)
+            # No st.rerun() needed: the button click already reruns the script and the
+            # feedback form is rendered further down this same run
             if st.button("Feedback", key="top_nav_feedback"):
                 st.session_state['show_feedback_modal'] = True
-                st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
 
         with header_cols[3]:
             st.markdown('<div class="text-link-button">', unsafe_allow_html=True)
             user_label = user_name.split()[0] + " ▾"
+            # The dropdown below reads the flag later in this run, so no extra rerun
             if st.button(user_label, key="top_nav_user_menu"):
                 st.session_state['show_user_menu'] = not st.session_state.get('show_user_menu', False)
-                st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
 
         with header_cols[4]:
@@ -3283,8 +3611,7 @@ def main():
             if st.button("Logout", key="top_nav_logout"):
                 st.session_state['authenticated'] = False
                 st.session_state['user'] = None
-                if 'contacts_df' in st.session_state:
-                    del st.session_state['contacts_df']
+                st.session_state.pop('contacts_df', None)
                 st.success("Logged out successfully!")
                 st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
@@ -3295,8 +3622,8 @@ def main():
 <div style='background: white; border: 1px solid #e5e7eb; border-radius: 8px;
      padding: 1rem; margin: 0.5rem 0 1rem auto; max-width: 300px; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.08);'>
     <p style='font-size: 0.875rem; color: var(--text-tertiary); margin: 0 0 0.5rem 0;'>Signed in as</p>
-    <p style='font-size: 1rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{user_name}</p>
-    <p style='font-size: 0.875rem; color: var(--text-secondary); margin: 0.25rem 0 0 0;'>{user_email}</p>
+    <p style='font-size: 1rem; font-weight: 600; color: var(--text-primary); margin: 0;'>{sanitize_html(user_name)}</p>
+    <p style='font-size: 0.875rem; color: var(--text-secondary); margin: 0.25rem 0 0 0;'>{sanitize_html(user_email)}</p>
     {f"<p style='font-size: 0.875rem; color: var(--text-secondary); margin: 0.75rem 0 0 0;'>{contact_count:,} contacts saved</p>" if contact_count > 0 else ""}
 </div>
 """, unsafe_allow_html=True)
@@ -3318,17 +3645,16 @@ def main():
         # header_cols[1] is spacer
 
         with header_cols[2]:
+            # Login/register pages are picked after the header in this same run, so no st.rerun()
             if st.button("Login", key="nav_login", type="secondary"):
                 st.session_state['show_register'] = False
                 st.session_state['show_forgot_password'] = False
                 st.session_state['show_login'] = True
-                st.rerun()
 
         with header_cols[3]:
             if st.button("Sign Up", key="nav_signup", type="primary"):
                 st.session_state['show_register'] = True
                 st.session_state['show_login'] = False
-                st.rerun()
 
     # Clean spacing after header
     st.markdown('<div style="height: 2rem;"></div>', unsafe_allow_html=True)
@@ -3337,109 +3663,15 @@ def main():
     render_feedback_modal()
 
     # Phase 3B: Migrate existing users to new search (one-time index build)
-    if st.session_state.get('authenticated') and HAS_NEW_SEARCH:
-        migrate_to_new_search()
+    if st.session_state.get('authenticated') and st.session_state.get('contacts_df') is not None:
+        search_module = load_search_integration()
+        if search_module:
+            search_module.migrate_to_new_search()
 
 
     # Apply dark mode CSS if enabled
     if st.session_state.get('dark_mode', False):
-        st.markdown("""
-        <style>
-            /* Dark Mode Overrides - Target ALL background elements */
-            html, body, [data-testid="stAppViewContainer"], [data-testid="stApp"], .main, .stApp {
-                background-color: #0a0a0a !important;
-                background: #0a0a0a !important;
-            }
-
-            /* Force block container background */
-            .block-container {
-                background-color: #0a0a0a !important;
-            }
-
-            h1 {
-                color: #ffffff !important;
-            }
-
-            .subtitle {
-                color: #b0b0b0 !important;
-            }
-
-            h2, h3, h4 {
-                color: #e0e0e0 !important;
-            }
-
-            .main .stMarkdown, .stMarkdown p, .stMarkdown div {
-                color: #b0b0b0 !important;
-            }
-
-            .stTextInput > div > div > input {
-                background: #1a1a1a !important;
-                color: #e0e0e0 !important;
-                border-color: #2a2a2a !important;
-            }
-
-            .stTextInput > div > div > input:focus {
-                border-color: #4a4a4a !important;
-                box-shadow: 0 0 0 3px rgba(255, 255, 255, 0.05) !important;
-            }
-
-            .stButton > button {
-                background: #ffffff !important;
-                color: #0a0a0a !important;
-            }
-
-            .stButton > button:hover {
-                background: #e0e0e0 !important;
-            }
-
-            .stFormSubmitButton > button {
-                background: #ffffff !important;
-                color: #0a0a0a !important;
-            }
-
-            .stDownloadButton > button {
-                background: #1a1a1a !important;
-                color: #e0e0e0 !important;
-                border-color: #4a4a4a !important;
-            }
-
-            .results-summary {
-                background: #1a1a1a !important;
-                border-color: #2a2a2a !important;
-            }
-
-            .stDataFrame {
-                border-color: #2a2a2a !important;
-            }
-
-            .streamlit-expanderHeader {
-                background: #1a1a1a !important;
-                color: #e0e0e0 !important;
-                border-color: #2a2a2a !important;
-            }
-
-            .stTabs {
-                background: #1a1a1a !important;
-                border-color: #2a2a2a !important;
-            }
-
-            .stSuccess {
-                background: #1a3a1a !important;
-                border-color: #2a5a2a !important;
-                color: #86efac !important;
-            }
-
-            .stInfo {
-                background: #1a2a3a !important;
-                border-color: #2a4a5a !important;
-                color: #7dd3fc !important;
-            }
-
-            hr {
-                border-color: #2a2a2a !important;
-            }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(_DARK_MODE_CSS, unsafe_allow_html=True)
 
     # Lower navigation - Dashboard/Connections (only show for authenticated users with contacts, NOT on profile page)
     if st.session_state.get('authenticated') and 'contacts_df' in st.session_state and not st.session_state.get('show_profile'):
@@ -3450,75 +3682,11 @@ def main():
             pending_requests_list = collaboration.get_pending_connection_requests(user_id)
             pending_requests_count = len(pending_requests_list)
 
-        # CSS for inactive navigation button (no box at all) - HIGH SPECIFICITY
-        st.markdown("""
-<style>
-/* Remove margins and ensure alignment */
-.inactive-nav-button > .stButton {
-    margin: 0 !important;
-}
-
-.inactive-nav-button > .stButton > button,
-.inactive-nav-button .stButton > button {
-    background: transparent !important;
-    border: 0px solid transparent !important;
-    box-shadow: none !important;
-    outline: none !important;
-    color: var(--text-secondary) !important;
-    font-weight: 500 !important;
-    padding: 12px 20px !important;
-    border-radius: 8px !important;
-    min-width: 120px !important;
-    height: 40px !important;
-    font-size: 15px !important;
-    transition: all 0.15s ease !important;
-    line-height: 1 !important;
-    display: inline-flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-}
-
-.inactive-nav-button > .stButton > button:hover,
-.inactive-nav-button .stButton > button:hover {
-    background: rgba(43, 108, 176, 0.05) !important;
-    color: var(--primary) !important;
-    border: 0px solid transparent !important;
-    box-shadow: none !important;
-}
-
-.inactive-nav-button > .stButton > button:focus,
-.inactive-nav-button > .stButton > button:active,
-.inactive-nav-button .stButton > button:focus,
-.inactive-nav-button .stButton > button:active {
-    background: transparent !important;
-    border: 0px solid transparent !important;
-    box-shadow: none !important;
-    outline: none !important;
-}
-
-/* Ensure active nav buttons also have proper height and alignment */
-div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
-    height: 40px !important;
-    display: inline-flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    line-height: 1 !important;
-}
-
-/* Lower nav container - force vertical alignment for all columns */
-.lower-nav-container [data-testid="column"] {
-    display: flex !important;
-    align-items: center !important;
-    min-height: 40px !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
         # Check which page we're on
         on_connections_page = st.session_state.get('show_connections', False)
 
         # Lower navigation buttons - single row with proper alignment
-        st.markdown('<div class="lower-nav-container">', unsafe_allow_html=True)
+        st.markdown(_LOWER_NAV_CSS + '<div class="lower-nav-container">', unsafe_allow_html=True)
         lower_nav_cols = st.columns([1, 0.1, 1.2, 8])
 
         with lower_nav_cols[0]:
@@ -3641,7 +3809,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
         user_has_contacts = False
         replace_contacts = False
         if st.session_state.get('authenticated'):
-            user_has_contacts = auth.get_contact_count(st.session_state['user']['id']) > 0
+            user_has_contacts = get_cached_contact_count(st.session_state['user']['id']) > 0
             if user_has_contacts:
                 st.info("You already have contacts saved. Upload a new CSV to replace them.")
                 replace_contacts = st.checkbox("Replace existing contacts", value=False,
@@ -3656,7 +3824,11 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
 
         st.markdown("</div>", unsafe_allow_html=True)  # Close card container
 
-        if uploaded_file:
+        if uploaded_file and st.session_state.get('failed_upload_id') == uploaded_file.file_id:
+            # This upload already failed to parse - don't re-parse it, log it again or spend
+            # another rate-limit slot on every rerun while it sits in the uploader
+            st.error("Couldn't read this file. Please upload the Connections.csv from your LinkedIn export.")
+        elif uploaded_file:
             # === SECURITY: Rate Limiting ===
             user_id = st.session_state.get('user', {}).get('id', 'anonymous')
             allowed, error_msg = check_rate_limit(user_id, 'csv_upload')
@@ -3681,6 +3853,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             print(f"Email enrichment failed: {e}")
                             # Continue without enrichment
 
+                        df = optimize_contact_dtypes(df)
                         st.session_state['contacts_df'] = df
 
                         # Get user_id (for both logged-in and anonymous)
@@ -3697,6 +3870,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                                     with st.spinner("Replacing contacts..."):
                                         if auth.delete_user_contacts(user_id):
                                             save_result = auth.save_contacts_to_db(user_id, df)
+                                            get_cached_contact_count.clear()
                                             if save_result['success']:
                                                 st.success(f"Replaced with {len(df)} new contacts!")
                                             else:
@@ -3706,6 +3880,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             else:
                                 # No existing contacts, just save
                                 save_result = auth.save_contacts_to_db(user_id, df)
+                                get_cached_contact_count.clear()
                                 if save_result['success']:
                                     st.success(f"Loaded and saved {len(df)} contacts to your account!")
                                 else:
@@ -3716,7 +3891,8 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             st.info("**Sign up** in the sidebar to save your contacts permanently!")
 
                         # Log CSV upload
-                        analytics.log_csv_upload(
+                        log_analytics(
+                            'log_csv_upload',
                             file_name=uploaded_file.name,
                             num_contacts=len(df),
                             success=True,
@@ -3724,15 +3900,16 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                         )
 
                         # Phase 3B: Build search indexes for fast future searches
-                        if HAS_NEW_SEARCH:
+                        search_module = load_search_integration()
+                        if search_module:
                             # Force rebuild since user uploaded new CSV
                             try:
-                                initialize_search_for_user(user_id, df, force_rebuild=True)
+                                search_module.initialize_search_for_user(user_id, df, force_rebuild=True)
                             except Exception as e:
                                 st.warning(f"Could not build search indexes: {e}")
 
                         # Phase 4: Pre-cache popular queries for instant search
-                        if HAS_AI_AGENT:
+                        if load_ai_search_agent():
                             try:
                                 client = get_client()
                                 initialize_search_caching(client, df)
@@ -3746,8 +3923,11 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
 
                         st.rerun()
                     else:
+                        st.session_state['failed_upload_id'] = uploaded_file.file_id
+
                         # Log failed upload
-                        analytics.log_csv_upload(
+                        log_analytics(
+                            'log_csv_upload',
                             file_name=uploaded_file.name,
                             num_contacts=0,
                             success=False,
@@ -3763,15 +3943,15 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
 """, unsafe_allow_html=True)
 
         # LinkedIn Download Instructions - Clean
-        st.markdown("<div style='max-width: 700px; margin: var(--space-16) auto;'><h3 style='font-size: 1.5rem; font-weight: 600; margin-bottom: var(--space-6);'>How to Get Your LinkedIn Data</h3>", unsafe_allow_html=True)
         st.markdown("""
+<div style='max-width: 700px; margin: var(--space-16) auto;'><h3 style='font-size: 1.5rem; font-weight: 600; margin-bottom: var(--space-6);'>How to Get Your LinkedIn Data</h3>
 <div class='card' style='margin-bottom: var(--space-8);'>
 <ol style='margin: 0; padding-left: 1.5rem; color: var(--text-secondary); line-height: 1.8;'>
-<li style='margin-bottom: var(--space-3);'>Go to <a href='https://www.linkedin.com/mypreferences/d/download-my-data' target='_blank' style='color: var(--primary); font-weight: 600; text-decoration: none;'>LinkedIn Data Download</a></li>
-<li style='margin-bottom: var(--space-3);'>Click "Request archive"</li>
-<li style='margin-bottom: var(--space-3);'>Wait 10-15 minutes for the email</li>
-<li style='margin-bottom: var(--space-3);'>Download and extract the ZIP file</li>
-<li style='margin-bottom: var(--space-3);'>Find the <strong>Connections.csv</strong> file</li>
+<li class='mb-3'>Go to <a href='https://www.linkedin.com/mypreferences/d/download-my-data' target='_blank' style='color: var(--primary); font-weight: 600; text-decoration: none;'>LinkedIn Data Download</a></li>
+<li class='mb-3'>Click "Request archive"</li>
+<li class='mb-3'>Wait 10-15 minutes for the email</li>
+<li class='mb-3'>Download and extract the ZIP file</li>
+<li class='mb-3'>Find the <strong>Connections.csv</strong> file</li>
 <li>Upload it above</li>
 </ol>
 </div>
@@ -3779,8 +3959,10 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
 """, unsafe_allow_html=True)
 
         # Example queries - Clean with clickable questions
-        st.markdown("<div style='max-width: 700px; margin: 0 auto;'><h3 style='font-size: 1.5rem; font-weight: 600; margin-bottom: var(--space-6);'>Example Searches</h3>", unsafe_allow_html=True)
-        st.markdown("<p style='color: var(--text-secondary); margin-bottom: var(--space-4); font-size: 0.9375rem;'>Click any question to try it:</p>", unsafe_allow_html=True)
+        st.markdown("""
+<div style='max-width: 700px; margin: 0 auto;'><h3 style='font-size: 1.5rem; font-weight: 600; margin-bottom: var(--space-6);'>Example Searches</h3>
+<p style='color: var(--text-secondary); margin-bottom: var(--space-4); font-size: 0.9375rem;'>Click any question to try it:</p></div>
+""", unsafe_allow_html=True)
 
         col1, col2, col3 = st.columns(3)
 
@@ -3838,7 +4020,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
         extended_count = 0
         if st.session_state.get('authenticated'):
             try:
-                extended_contacts_df = collaboration.get_contacts_from_connected_users(user_id)
+                extended_contacts_df = get_extended_network_contacts(user_id)
                 extended_count = len(extended_contacts_df) if not extended_contacts_df.empty else 0
                 # Debug: Print to console to verify counts
                 print(f"DEBUG - My Network: {my_network_count}, Extended Network: {extended_count}")
@@ -3937,10 +4119,9 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                     st.rerun()
 
         # Auto-execute search from example questions
-        auto_query = st.session_state.get('auto_execute_query')
+        # pop() reads and clears the flag in one step
+        auto_query = st.session_state.pop('auto_execute_query', None)
         if auto_query:
-            # Clear the flag
-            del st.session_state['auto_execute_query']
             # Set query to execute
             query = auto_query
             search_button = True
@@ -3981,22 +4162,32 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
 
             if query_type == "analytics":
                 # Handle analytics query
+                # Check if query might also want to see people (hybrid query)
+                # Keywords like "how many people" suggest they might want the list too
+                is_hybrid = bool(HYBRID_QUERY_PATTERN.search(query))
+
                 with st.spinner("AI is analyzing your network..."):
-                    result = analyze_network_with_ai(query, contacts_df)
+                    # For hybrid queries, fire the people-search request now so it runs
+                    # in parallel with the analytics call instead of after it
+                    intent_request = start_search_intent_request(query, contacts_df) if is_hybrid else None
+
+                    # Show the answer as it streams in; the formatted card replaces it below
+                    stream_placeholder = st.empty()
+                    try:
+                        result = analyze_network_with_ai(query, contacts_df, stream_to=stream_placeholder)
+                    except Exception:
+                        if intent_request is not None:
+                            intent_request.cancel()
+                        raise
+                    stream_placeholder.empty()
 
                     if result['success']:
                         # Store analytics result
                         st.session_state['analytics_result'] = result['answer']
 
-                        # Check if query might also want to see people (hybrid query)
-                        # Keywords like "how many people" suggest they might want the list too
-                        query_lower = query.lower()
-                        hybrid_keywords = ['how many people', 'how many contacts', 'who all']
-                        is_hybrid = any(keyword in query_lower for keyword in hybrid_keywords)
-
                         if is_hybrid:
                             # Also run search to get the people list
-                            intent = extract_search_intent(query, contacts_df)
+                            intent = extract_search_intent(query, contacts_df, pending_request=intent_request)
                             if intent:
                                 filtered_df = filter_contacts(contacts_df, intent)
                                 if not filtered_df.empty:
@@ -4005,6 +4196,10 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                                     summary = generate_summary(filtered_df, intent)
                                     st.session_state['summary'] = summary
                     else:
+                        # Nothing will read the people-search result now; cancelling drops
+                        # the request if the pool hasn't sent it yet
+                        if intent_request is not None:
+                            intent_request.cancel()
                         st.error(f"Analysis failed: {result.get('error', 'Unknown error')}")
             else:
                 # Handle search query (find people)
@@ -4027,7 +4222,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
 
                     if search_extended:
                         try:
-                            extended_contacts_df = collaboration.get_contacts_from_connected_users(user_id)
+                            extended_contacts_df = get_extended_network_contacts(user_id)
                             if not extended_contacts_df.empty:
                                 datasets_to_search.append(extended_contacts_df)
                                 search_network_names.append("Extended Network")
@@ -4043,10 +4238,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                         spinner_text = f"Searching {search_network_names[0]}..."
                     else:
                         # Combine both networks
-                        search_contacts_df = pd.concat(datasets_to_search, ignore_index=True)
-                        # Remove duplicates based on email (if present)
-                        if 'email' in search_contacts_df.columns:
-                            search_contacts_df = search_contacts_df.drop_duplicates(subset=['email'], keep='first')
+                        search_contacts_df = get_combined_search_frame(*datasets_to_search)
                         spinner_text = "Searching both networks..."
 
                 # Only proceed if we have contacts to search
@@ -4054,7 +4246,8 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                     # Check for industry expansion FIRST (before AI agent)
                     # This ensures queries like "finance", "tech", "VC" use company-based search
                     should_use_industry_expansion = False
-                    if HAS_NEW_SEARCH:
+                    search_module = load_search_integration()
+                    if search_module:
                         try:
                             from services.industry_expansion import expand_industry_query
                             expansion = expand_industry_query(query)
@@ -4065,10 +4258,10 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             print(f"Industry expansion check failed: {e}")
 
                     # Phase 4: Use AI search agent for complex queries (SKIP if industry expansion is better)
-                    if HAS_AI_AGENT and not should_use_industry_expansion:
+                    create_ai_search_agent = load_ai_search_agent()
+                    if create_ai_search_agent and not should_use_industry_expansion:
                         # Clear any previous analytics result
-                        if 'analytics_result' in st.session_state:
-                            del st.session_state['analytics_result']
+                        st.session_state.pop('analytics_result', None)
 
                         try:
                             # Get OpenAI client
@@ -4130,15 +4323,24 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             # Fall through to regular search
 
                     # Fallback to Phase 3B hybrid search
-                    if HAS_NEW_SEARCH and ('filtered_df' not in st.session_state or st.session_state.get('filtered_df') is None or st.session_state['filtered_df'].empty):
+                    if search_module and ('filtered_df' not in st.session_state or st.session_state.get('filtered_df') is None or st.session_state['filtered_df'].empty):
                         with st.spinner(spinner_text):
                             # Clear any previous analytics result
-                            if 'analytics_result' in st.session_state:
-                                del st.session_state['analytics_result']
+                            st.session_state.pop('analytics_result', None)
 
                             try:
-                                # Use hybrid search
-                                search_result = smart_search(query, search_contacts_df)
+                                # Use hybrid search. Re-submitting the same query against the same
+                                # contacts frame reuses the previous result instead of searching again.
+                                last_search = st.session_state.get('_last_smart_search')
+                                if last_search and last_search['query'] == query and last_search['frame'] is search_contacts_df:
+                                    search_result = last_search['result']
+                                else:
+                                    search_result = search_module.smart_search(query, search_contacts_df)
+                                    st.session_state['_last_smart_search'] = {
+                                        'query': query,
+                                        'frame': search_contacts_df,
+                                        'result': search_result
+                                    }
 
                                 # Fast hybrid search result
                                 filtered_df = search_result.get('filtered_df', pd.DataFrame())
@@ -4166,7 +4368,8 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                                     st.success(f"Lightning fast ({search_result.get('latency_ms', 0):.0f}ms) • {len(filtered_df)} results")
 
                                 # Log search query
-                                analytics.log_search_query(
+                                log_analytics(
+                                    'log_search_query',
                                     query=query,
                                     results_count=len(st.session_state.get('filtered_df', pd.DataFrame())),
                                     intent={'query': query, 'tier': search_result.get('tier_used', 'unknown')},
@@ -4195,8 +4398,7 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             st.session_state['last_intent'] = intent
 
                             # Clear any previous analytics result
-                            if 'analytics_result' in st.session_state:
-                                del st.session_state['analytics_result']
+                            st.session_state.pop('analytics_result', None)
 
                             # Debug: Show what the AI understood
                             with st.expander("Debug: What the AI understood from your query"):
@@ -4211,7 +4413,8 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
                             st.session_state['summary'] = summary
 
                             # Log search query
-                            analytics.log_search_query(
+                            log_analytics(
+                                'log_search_query',
                                 query=query,
                                 results_count=len(filtered_df),
                                 intent=intent,
@@ -4222,575 +4425,49 @@ div[data-testid="column"] > div > .stButton > button[kind="secondary"] {
         st.markdown("---")
 
         # Display AI analytics insights if available
+        # Spacing comes from margin classes on the surrounding markup rather than
+        # separate "<br>" markdown elements
         if 'analytics_result' in st.session_state:
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("### AI Insights")
+            st.markdown("<br>\n\n### AI Insights", unsafe_allow_html=True)
             st.markdown(f"""
-            <div class='results-summary'>
+            <div class='results-summary mb-12'>
                 {st.session_state['analytics_result']}
             </div>
             """, unsafe_allow_html=True)
-            st.markdown("<br>", unsafe_allow_html=True)
 
         # Display search results (people list)
         if 'filtered_df' in st.session_state and 'summary' in st.session_state:
-            st.markdown("<br>", unsafe_allow_html=True)
+            filtered_df = st.session_state['filtered_df']
 
             # Summary in premium card
+            summary_classes = 'results-summary mt-12' if filtered_df.empty else 'results-summary mt-12 mb-12'
             st.markdown(f"""
-            <div class='results-summary'>
+            <div class='{summary_classes}'>
                 {st.session_state['summary']}
             </div>
             """, unsafe_allow_html=True)
 
-            filtered_df = st.session_state['filtered_df']
-
             if not filtered_df.empty:
-                st.markdown("<br>", unsafe_allow_html=True)
-
-                # Check which networks were searched
-                search_my = st.session_state.get('search_my_network', True)
-                search_extended = st.session_state.get('search_extended_network', False)
-                searching_both = search_my and search_extended
-                searching_only_extended = search_extended and not search_my
-
-                # Pagination setup
-                contacts_per_page = 10
-                total_contacts = len(filtered_df)
-                total_pages = (total_contacts + contacts_per_page - 1) // contacts_per_page  # Ceiling division
-
-                # Initialize pagination state
-                if 'current_page' not in st.session_state:
-                    st.session_state['current_page'] = 1
-
-                # Reset to page 1 if we just did a new search
-                if 'last_search_query' not in st.session_state or st.session_state.get('last_search_query') != query:
-                    st.session_state['current_page'] = 1
-                    if query:
-                        st.session_state['last_search_query'] = query
-
-                current_page = st.session_state['current_page']
-
-                # Header - always show selection controls since results may contain mixed sources
-                col_header1, col_header2, col_header3 = st.columns([2, 1, 1])
-                with col_header1:
-                    if searching_both:
-                        st.markdown("### Results from Both Networks")
-                    elif searching_only_extended:
-                        st.markdown("### Results from Extended Network")
-                    else:
-                        st.markdown("### Select Contacts")
-                with col_header2:
-                    st.markdown(f"<div style='text-align: right; padding-top: 0.5rem; color: #666;'>Page {current_page} of {total_pages}</div>", unsafe_allow_html=True)
-                with col_header3:
-                    if search_my:  # Only show select all if my network is included
-                        select_all_page = st.checkbox("Select All on Page", key="select_all_page_checkbox")
-                    else:
-                        select_all_page = False
-
-                # Calculate pagination slice
-                start_idx = (current_page - 1) * contacts_per_page
-                end_idx = min(start_idx + contacts_per_page, total_contacts)
-
-                # Get contacts for current page
-                page_contacts = filtered_df.iloc[start_idx:end_idx]
-
-                # Display contacts with checkboxes
-                display_cols = []
-                for col in ['full_name', 'position', 'company', 'email']:
-                    if col in filtered_df.columns:
-                        display_cols.append(col)
-
-                # Initialize selected contacts in session state
-                if 'selected_contacts' not in st.session_state:
-                    st.session_state['selected_contacts'] = set()
-
-                # Handle select all on page (only if my network is included)
-                if search_my and select_all_page:
-                    for i in range(start_idx, end_idx):
-                        # Only add My Network contacts (those without owner_user_id)
-                        row_data = filtered_df.iloc[i]
-                        if pd.isna(row_data.get('owner_user_id')):
-                            st.session_state['selected_contacts'].add(i)
-                elif search_my and not select_all_page:
-                    # Check if all My Network contacts on current page are selected, if so deselect
-                    my_network_indices = []
-                    for i in range(start_idx, end_idx):
-                        row_data = filtered_df.iloc[i]
-                        if pd.isna(row_data.get('owner_user_id')):
-                            my_network_indices.append(i)
-
-                    if my_network_indices:
-                        all_on_page_selected = all(i in st.session_state['selected_contacts'] for i in my_network_indices)
-                        if all_on_page_selected:
-                            for i in my_network_indices:
-                                st.session_state['selected_contacts'].discard(i)
-
-                # Display each contact card
-                for page_idx, (idx, row) in enumerate(page_contacts.iterrows()):
-                    # Actual index in the full filtered_df
-                    actual_idx = start_idx + page_idx
-
-                    # Determine if this contact is from extended network
-                    # Extended network contacts have an owner_user_id field
-                    is_extended_contact = not pd.isna(row.get('owner_user_id'))
-
-                    if is_extended_contact:
-                        # Extended Network Contact: Show contact with "Request Intro" button
-                        col1, col2 = st.columns([3, 1])
-
-                        with col1:
-                            name = row.get('full_name', 'No Name')
-                            job_position = row.get('position', 'No Position')
-                            company = row.get('company', 'No Company')
-                            owner_name = row.get('owner_name', 'Unknown')
-
-                            # === SECURITY: Sanitize extended network contact data ===
-                            safe_name = sanitize_html(name)
-                            safe_position = sanitize_html(job_position)
-                            safe_company = sanitize_html(company)
-                            safe_owner = sanitize_html(owner_name)
-
-                            # Notion-inspired extended network card
-                            st.markdown(f"""
-                            <div class='extended-contact-card'>
-                                <div class='contact-name'>{safe_name}</div>
-                                <div class='contact-position'>{safe_position}</div>
-                                <div class='contact-company'>🏢 {safe_company}</div>
-                                <div class='extended-badge'>
-                                    In {safe_owner}'s network
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-
-                        with col2:
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            # Request intro button
-                            if st.button(f"Request Intro", key=f"req_intro_{actual_idx}_{idx}", use_container_width=True):
-                                # Store contact info in session state to show request form
-                                st.session_state['intro_request_contact'] = {
-                                    'contact_id': row.get('id'),
-                                    'target_name': row.get('full_name', ''),
-                                    'target_company': row.get('company', ''),
-                                    'target_position': row.get('position', ''),
-                                    'target_email': row.get('email', ''),
-                                    'connector_id': row.get('owner_user_id'),
-                                    'connector_name': row.get('owner_name'),
-                                    'connector_email': row.get('owner_email')
-                                }
-                                st.rerun()
-                    else:
-                        # My Network: Show contact with checkbox for selection
-                        contact_selected = actual_idx in st.session_state['selected_contacts']
-
-                        col1, col2 = st.columns([0.1, 0.9])
-
-                        with col1:
-                            if st.checkbox("", key=f"contact_{actual_idx}_{idx}", value=contact_selected, label_visibility="collapsed"):
-                                st.session_state['selected_contacts'].add(actual_idx)
-                            else:
-                                st.session_state['selected_contacts'].discard(actual_idx)
-
-                        with col2:
-                            # Debug: Log what columns and data we have
-                            if idx == 0:  # Only log first result
-                                print(f"DEBUG: Available columns: {list(row.keys())}")
-                                print(f"DEBUG: Row data sample: {dict(list(row.items())[:5])}")
-
-                            name = row.get('full_name', '').strip() or 'No Name'
-                            job_position = row.get('position', '').strip() or 'No Position'
-                            company = row.get('company', '').strip() or 'No Company'
-                            email = row.get('email', '').strip()
-
-                            # Debug: Log the extracted values
-                            if idx == 0:  # Only log first result
-                                print(f"DEBUG: Extracted - name: '{name}', position: '{job_position}', company: '{company}'")
-
-                            # === SECURITY: Sanitize all user-generated content to prevent XSS ===
-                            safe_name = sanitize_html(name)
-                            safe_position = sanitize_html(job_position)
-                            safe_company = sanitize_html(company)
-                            safe_email = sanitize_html(email) if email else ''
-
-                            # Build contact card HTML (Happenstance style with match explanations)
-                            avatar_initial = name[0].upper() if name and name != 'No Name' else '?'
-
-                            # Build match explanation if we have query context
-                            match_explanation = ""
-                            if query and query.strip():
-                                query_lower = query.lower()
-                                reasons = []
-
-                                # Check for company match
-                                if company and company != 'No Company':
-                                    if any(word in company.lower() for word in query_lower.split()):
-                                        reasons.append(f"<div class='match-reason'><span class='match-reason-icon'>✓</span><span>Company: <strong>{safe_company}</strong></span></div>")
-
-                                # Check for position match
-                                if job_position and job_position != 'No Position':
-                                    if any(word in job_position.lower() for word in query_lower.split()):
-                                        reasons.append(f"<div class='match-reason'><span class='match-reason-icon'>✓</span><span>Position: <strong>{safe_position}</strong></span></div>")
-
-                                # Check for name match
-                                if name and name != 'No Name':
-                                    if any(word in name.lower() for word in query_lower.split()):
-                                        reasons.append(f"<div class='match-reason'><span class='match-reason-icon'>✓</span><span>Name match</span></div>")
-
-                                if reasons:
-                                    match_explanation = f"""<div class='match-explanation'><div class='match-explanation-title'>Why this match</div>{''.join(reasons)}</div>"""
-
-                            # Build the HTML (clean, no emojis - Wispr Flow style)
-                            email_badge = f"<span class='contact-email'>{safe_email}</span>" if email else ""
-
-                            contact_card_html = f"""
-<div class='contact-card'>
-    <div style='display: flex; align-items: flex-start; gap: 1rem;'>
-        <div class='contact-avatar'>{avatar_initial}</div>
-        <div style='flex: 1; min-width: 0;'>
-            <div class='contact-name'>{safe_name}</div>
-            <div class='contact-position'>{safe_position}</div>
-            <div class='contact-info-row'>
-                <span class='contact-company'>{safe_company}</span>
-                {email_badge}
-            </div>
-            {match_explanation}
-        </div>
-    </div>
-</div>
-"""
-
-                            st.markdown(contact_card_html, unsafe_allow_html=True)
-
-                # Pagination controls - Notion style
-                if total_pages > 1:
-                    st.markdown('<div style="margin-top: var(--space-8); margin-bottom: var(--space-6);"></div>', unsafe_allow_html=True)
-                    col_prev, col_pages, col_next = st.columns([1, 3, 1])
-
-                    with col_prev:
-                        if st.button("← Previous", disabled=(current_page == 1), use_container_width=True, type="secondary"):
-                            st.session_state['current_page'] = max(1, current_page - 1)
-                            st.rerun()
-
-                    with col_pages:
-                        # Show page numbers
-                        pages_to_show = {1, max(1, current_page - 1), current_page, min(total_pages, current_page + 1), total_pages}
-                        pages_to_show = sorted(pages_to_show)
-
-                        cols = st.columns(len(pages_to_show))
-                        for i, page_num in enumerate(pages_to_show):
-                            with cols[i]:
-                                if page_num == current_page:
-                                    st.markdown(f"<div class='pagination-current'>{page_num}</div>", unsafe_allow_html=True)
-                                else:
-                                    if st.button(str(page_num), key=f"page_{page_num}", use_container_width=True, type="secondary"):
-                                        st.session_state['current_page'] = page_num
-                                        st.rerun()
-
-                    with col_next:
-                        if st.button("Next →", disabled=(current_page == total_pages), use_container_width=True, type="secondary"):
-                            st.session_state['current_page'] = min(total_pages, current_page + 1)
-                            st.rerun()
-
-                    st.markdown(f"<div style='text-align: center; color: var(--text-tertiary); margin-top: var(--space-4); font-size: 0.9375rem;'>Showing {start_idx + 1}-{end_idx} of {total_contacts} contacts</div>", unsafe_allow_html=True)
-
-                # Show intro request form if extended network contact selected
-                if 'intro_request_contact' in st.session_state:
-                    contact = st.session_state['intro_request_contact']
+                render_results_list(filtered_df, query, user_id)
 
-                    st.markdown("---")
-                    st.markdown("### Request Introduction")
 
-                    st.markdown(f"""
-                    <div style='background: #fffbeb; padding: 1.5rem; border-radius: 10px; border: 1px solid #fbbf24; margin-bottom: 1.5rem;'>
-                        <div style='font-weight: 600; font-size: 1rem; color: #1a1a1a; margin-bottom: 0.5rem;'>
-                            Requesting intro to: <span style='color: #3b82f6;'>{contact['target_name']}</span>
-                        </div>
-                        <div style='color: #666; font-size: 0.9rem; margin-bottom: 0.3rem;'>
-                            {contact['target_position']} at {contact['target_company']}
-                        </div>
-                        <div style='color: #999; font-size: 0.85rem;'>
-                            Via: {contact['connector_name']} ({contact['connector_email']})
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    with st.form("intro_request_form"):
-                        request_message = st.text_area(
-                            "Why do you want to meet this person? *",
-                            placeholder="e.g., I'm raising a seed round for my fintech startup and would love to get Sarah's advice on product-market fit...",
-                            height=150,
-                            help="This will be shown to the person you want to meet"
-                        )
-
-                        context_for_connector = st.text_area(
-                            "Additional context for your connection (optional)",
-                            placeholder="e.g., We met at the Tech Conference 2024. Remember we talked about my startup idea?",
-                            height=100,
-                            help="Private message to help your connection make the intro"
-                        )
-
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            submit_request = st.form_submit_button("Send Request", type="primary", use_container_width=True)
-                        with col2:
-                            cancel_request = st.form_submit_button("Cancel", use_container_width=True)
-
-                        if submit_request:
-                            if not request_message.strip():
-                                st.error("Please explain why you want this introduction")
-                            else:
-                                # Create intro request
-                                result = collaboration.create_intro_request(
-                                    requester_id=user_id,
-                                    connector_id=contact['connector_id'],
-                                    target_contact_id=contact['contact_id'],
-                                    target_name=contact['target_name'],
-                                    target_company=contact['target_company'],
-                                    target_position=contact['target_position'],
-                                    target_email=contact['target_email'],
-                                    request_message=request_message.strip(),
-                                    context_for_connector=context_for_connector.strip() if context_for_connector.strip() else None
-                                )
-
-                                if result['success']:
-                                    st.success(f"Introduction request sent to {contact['connector_name']}!")
-                                    del st.session_state['intro_request_contact']
-                                    st.rerun()
-                                else:
-                                    st.error(result['message'])
-
-                        if cancel_request:
-                            del st.session_state['intro_request_contact']
-                            st.rerun()
-
-                # Action buttons for selected contacts (My Network contacts only)
-                # Only show if we searched My Network and have selections
-                if search_my and 'selected_contacts' in st.session_state and len(st.session_state['selected_contacts']) > 0:
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    st.markdown(f"**{len(st.session_state['selected_contacts'])} contact(s) selected**")
-
-                    # Email customization options
-                    st.markdown("<br>", unsafe_allow_html=True)
-
-                    col_purpose, col_tone = st.columns(2)
-
-                    with col_purpose:
-                        email_purpose = st.selectbox(
-                            "What's the purpose of your email?",
-                            [
-                                "Just catching up / Reconnecting",
-                                "I'm looking for a job",
-                                "I'm looking to hire",
-                                "Pitching my startup/idea",
-                                "Asking for advice/mentorship",
-                                "Making an introduction",
-                                "Requesting a coffee chat",
-                                "Seeking information/insights"
-                            ],
-                            key="email_purpose_selector"
-                        )
-
-                    with col_tone:
-                        email_tone = st.selectbox(
-                            "What tone should the email have?",
-                            [
-                                "Friendly & Casual",
-                                "Professional & Formal",
-                                "Enthusiastic & Energetic",
-                                "Direct & Brief",
-                                "Humble & Respectful"
-                            ],
-                            key="email_tone_selector"
-                        )
-
-                    # Additional context text area
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    additional_context = st.text_area(
-                        "Additional context (optional)",
-                        placeholder="e.g., 'We met at the Tech Conference 2023' or 'They mentored me during my internship' or 'We worked together on Project X'",
-                        help="Add any personal context about your relationship or what you know about these connections. This helps create more authentic emails.",
-                        height=100,
-                        key="additional_context_input"
-                    )
-
-                    # Action buttons
-                    col1, col2, col3 = st.columns(3)
-
-                    with col1:
-                        if st.button("Generate Personalized Emails", use_container_width=True, type="primary"):
-                            # Get selected contacts by position
-                            selected_positions = sorted(list(st.session_state['selected_contacts']))
-                            selected_df = filtered_df.iloc[selected_positions]
-
-                            # Generate personalized emails with loading spinner
-                            with st.spinner(f"AI is writing {len(selected_df)} personalized email(s)..."):
-                                try:
-                                    email_drafts = generate_personalized_emails(selected_df, email_purpose, email_tone, additional_context)
-                                    st.session_state['email_drafts'] = email_drafts
-                                    # Initialize to show first contact's email
-                                    if 'active_email_tab' not in st.session_state:
-                                        st.session_state['active_email_tab'] = 0
-
-                                    # Log successful email generation
-                                    analytics.log_email_generation(
-                                        num_contacts=len(selected_df),
-                                        email_purpose=email_purpose,
-                                        email_tone=email_tone,
-                                        success=True,
-                                        session_id=st.session_state['session_id']
-                                    )
-                                    st.success(f"Generated {len(selected_df)} personalized email draft(s)!")
-                                except Exception as e:
-                                    # Log failed email generation
-                                    analytics.log_email_generation(
-                                        num_contacts=len(selected_df),
-                                        email_purpose=email_purpose,
-                                        email_tone=email_tone,
-                                        success=False,
-                                        session_id=st.session_state['session_id']
-                                    )
-                                    st.error(f"Failed to generate emails: {str(e)}")
-
-                    with col2:
-                        if st.button("Copy Contact Info", use_container_width=True):
-                            selected_positions = sorted(list(st.session_state['selected_contacts']))
-                            selected_df = filtered_df.iloc[selected_positions]
-                            contact_info = "\n".join([
-                                f"{row.get('full_name', '')} - {row.get('position', '')} at {row.get('company', '')} ({row.get('email', 'No email')})"
-                                for _, row in selected_df.iterrows()
-                            ])
-                            st.session_state['contact_info'] = contact_info
-
-                            # Log export
-                            analytics.log_contact_export(
-                                export_type="contact_info",
-                                num_contacts=len(selected_df),
-                                session_id=st.session_state['session_id']
-                            )
-
-                            st.success("Contact info copied! Check below.")
-
-                    with col3:
-                        # CSV export of selected
-                        selected_positions = sorted(list(st.session_state['selected_contacts']))
-                        selected_df = filtered_df.iloc[selected_positions]
-                        csv = selected_df[display_cols].to_csv(index=False)
-                        st.download_button(
-                            label="Export Selected",
-                            data=csv,
-                            file_name="selected_contacts.csv",
-                            mime="text/csv",
-                            use_container_width=True
-                        )
-
-                # Display generated email drafts with tabs
-                if 'email_drafts' in st.session_state and st.session_state['email_drafts']:
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    st.markdown("### Email Drafts")
-
-                    email_drafts = st.session_state['email_drafts']
-
-                    # Create tabs for each person
-                    if len(email_drafts) > 1:
-                        tab_labels = [draft['name'] for draft in email_drafts]
-                        tabs = st.tabs(tab_labels)
-
-                        for idx, tab in enumerate(tabs):
-                            with tab:
-                                draft = email_drafts[idx]
-                                st.markdown(f"""
-                                <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;'>
-                                    <div style='color: #666; font-size: 0.9rem;'>TO:</div>
-                                    <div style='font-weight: 600; margin-bottom: 0.5rem;'>{draft['name']} ({draft['email']})</div>
-                                    <div style='color: #666; font-size: 0.9rem;'>{draft['position']} at {draft['company']}</div>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                st.text_area(
-                                    "Email draft:",
-                                    value=draft['email_text'],
-                                    height=350,
-                                    key=f"email_text_{idx}",
-                                    label_visibility="collapsed"
-                                )
-
-                                if draft.get('error'):
-                                    st.error("There was an error generating this email. Please check your OpenAI API settings.")
-                                else:
-                                    st.info("AI-generated draft - please personalize before sending!")
-                    else:
-                        # Single email - no tabs needed
-                        draft = email_drafts[0]
-                        st.markdown(f"""
-                        <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;'>
-                            <div style='color: #666; font-size: 0.9rem;'>TO:</div>
-                            <div style='font-weight: 600; margin-bottom: 0.5rem;'>{draft['name']} ({draft['email']})</div>
-                            <div style='color: #666; font-size: 0.9rem;'>{draft['position']} at {draft['company']}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-                        st.text_area(
-                            "Email draft:",
-                            value=draft['email_text'],
-                            height=350,
-                            key="email_text_single",
-                            label_visibility="collapsed"
-                        )
-
-                        if draft.get('error'):
-                            st.error("There was an error generating this email. Please check your OpenAI API settings.")
-                        else:
-                            st.info("AI-generated draft - please personalize before sending!")
-
-                    if st.button("Clear All Email Drafts"):
-                        del st.session_state['email_drafts']
-                        if 'active_email_tab' in st.session_state:
-                            del st.session_state['active_email_tab']
-                        st.rerun()
-
-                # Display copied contact info
-                if 'contact_info' in st.session_state:
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    st.markdown("### Contact Information")
-                    st.code(st.session_state['contact_info'], language="text")
-                    if st.button("Clear Contact Info"):
-                        del st.session_state['contact_info']
-                        st.rerun()
-
-                # Export all functionality (moved to bottom)
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("---")
-                st.markdown("**Export All Results:**")
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    csv = filtered_df[display_cols].to_csv(index=False)
-                    st.download_button(
-                        label="Download All as CSV",
-                        data=csv,
-                        file_name="all_contacts.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
-
-                with col2:
-                    text_output = "\n".join([
-                        f"{row.get('full_name', '')} - {row.get('position', '')} at {row.get('company', '')}"
-                        for _, row in filtered_df.iterrows()
-                    ])
-                    st.download_button(
-                        label="Download All as TXT",
-                        data=text_output,
-                        file_name="all_contacts.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
+@st.cache_resource
+def _check_env():
+    """Validate required environment once per server process (not on every rerun)"""
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        # Raising (instead of returning None) keeps the failure out of the cache,
+        # so fixing the .env and rerunning picks up the key
+        raise RuntimeError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file")
+    return key
 
 
 if __name__ == "__main__":
     # Check for API key
-    if not os.getenv("OPENAI_API_KEY"):
-        st.error("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file")
+    try:
+        _check_env()
+    except RuntimeError as e:
+        st.error(str(e))
         st.stop()
 
     main()
@@ -8,7 +8,7 @@ import bcrypt
 from datetime import datetime
 from dotenv import load_dotenv
 from supabase import create_client, Client
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 # Load environment variables
 load_dotenv()
@@ -340,6 +340,9 @@ def change_password(user_id: str, old_password: str, new_password: str) -> Dict[
 
 # Contact Management Functions
 
+# Contact columns stored in the contacts table (everything else there is internal bookkeeping)
+CONTACT_COLUMNS = ['first_name', 'last_name', 'full_name', 'company', 'position', 'email', 'connected_on']
+
 def save_contacts_to_db(user_id: str, contacts_df) -> Dict[str, Any]:
     """
     Save user's LinkedIn contacts to database
@@ -356,7 +359,7 @@ def save_contacts_to_db(user_id: str, contacts_df) -> Dict[str, Any]:
 
     try:
         # Only keep columns that exist in database schema
-        db_columns = ['first_name', 'last_name', 'full_name', 'company', 'position', 'email', 'connected_on']
+        db_columns = CONTACT_COLUMNS
 
         # Filter DataFrame to only include columns we have in the DB
         df_filtered = contacts_df[[col for col in db_columns if col in contacts_df.columns]].copy()
@@ -411,12 +414,13 @@ def save_contacts_to_db(user_id: str, contacts_df) -> Dict[str, Any]:
             'message': f'Error saving contacts: {str(e)}'
         }
 
-def load_user_contacts(user_id: str) -> Optional[Any]:
+def load_user_contacts(user_id: str, columns: Optional[List[str]] = None) -> Optional[Any]:
     """
     Load user's contacts from database
 
     Args:
         user_id: User's UUID
+        columns: Contact columns to fetch (defaults to all of CONTACT_COLUMNS)
 
     Returns:
         Pandas DataFrame with contacts or None if no contacts found
@@ -424,17 +428,16 @@ def load_user_contacts(user_id: str) -> Optional[Any]:
     import pandas as pd
     supabase = get_supabase_client()
 
+    # Select only the contact columns, so internal columns (id, user_id, last_updated)
+    # are never transferred and there is nothing to drop afterwards
+    columns = list(columns or CONTACT_COLUMNS)
+
     try:
-        response = supabase.table('contacts').select("*").eq('user_id', user_id).execute()
+        response = supabase.table('contacts').select(",".join(columns)).eq('user_id', user_id).execute()
 
         if response.data and len(response.data) > 0:
             # Convert to DataFrame
-            df = pd.DataFrame(response.data)
-            # Remove internal columns for display
-            columns_to_drop = ['user_id', 'id', 'last_updated']
-            df = df.drop([col for col in columns_to_drop if col in df.columns], axis=1)
-
-            return df
+            return pd.DataFrame(response.data, columns=columns)
 
         return None
 
@@ -351,11 +351,11 @@ try:
             data=analytics_json,
             file_name=f"analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json",
-            width="stretch"
+            use_container_width=True
         )
 
     with col2:
-        if st.button("🗑️ Clear All Logs", width="stretch", type="secondary"):
+        if st.button("🗑️ Clear All Logs", use_container_width=True, type="secondary"):
             if st.session_state.get('confirm_clear'):
                 analytics.clear_logs()
                 st.success("All logs cleared!")
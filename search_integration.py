@@ -6,6 +6,7 @@ Drop-in replacement for expensive GPT search using new 4-stage pipeline
 import streamlit as st
 import pandas as pd
 from typing import Dict, Any, List
+import hashlib
 import time
 
 # Import new integrated search system
@@ -46,6 +47,24 @@ def get_search_engine():
     return st.session_state['integrated_search_engine']
 
 
+def contacts_fingerprint(contacts_df: pd.DataFrame) -> str:
+    """
+    Short content hash of a contacts DataFrame (values and column names, not the index)
+
+    Hashing touches every cell, so the result is remembered for the frame object in
+    session state; asking again for the same frame is O(1).
+    """
+    cached = st.session_state.get('_contacts_fingerprint')
+    if cached is not None and cached['frame'] is contacts_df:
+        return cached['hash']
+
+    row_hashes = pd.util.hash_pandas_object(contacts_df, index=False).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update('\x1f'.join(map(str, contacts_df.columns)).encode('utf-8'))
+    st.session_state['_contacts_fingerprint'] = {'frame': contacts_df, 'hash': digest.hexdigest()}
+    return st.session_state['_contacts_fingerprint']['hash']
+
+
 def initialize_search_for_user(user_id: str, contacts_df: pd.DataFrame, force_rebuild: bool = False):
     """
     Initialize search indexes for a user with three-tier caching
@@ -69,6 +88,13 @@ def initialize_search_for_user(user_id: str, contacts_df: pd.DataFrame, force_re
     current_version = st.session_state.get('contacts_version', 0)
     stored_user_id = st.session_state.get('indexed_user_id', None)
 
+    # A forced rebuild (new CSV upload) is skipped when it's byte-for-byte the same
+    # contacts the in-memory indexes were just built from. Only hashed here and on a
+    # rebuild - the plain L1 hit below runs on every rerun and must stay O(1).
+    if force_rebuild and stored_user_id == user_id and st.session_state.get('indexed_contacts_hash') == contacts_fingerprint(contacts_df):
+        print(f"✅ L1 Cache HIT: Contacts unchanged since last index build for user {user_id}")
+        return True
+
     # L1 Cache: Check session state (already in memory)
     if not force_rebuild and stored_user_id == user_id:
         # Indexes already loaded in this session
@@ -100,6 +126,7 @@ def initialize_search_for_user(user_id: str, contacts_df: pd.DataFrame, force_re
 
             # Store in session state for L1 cache
             st.session_state['indexed_user_id'] = user_id
+            st.session_state['indexed_contacts_hash'] = contacts_fingerprint(contacts_df)
             st.session_state['contacts_version'] = current_version + 1
 
             print(f"✅ L3 Cache: Built new indexes for user {user_id}")
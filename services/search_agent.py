@@ -45,6 +45,7 @@ class SearchTools:
             contacts_df: DataFrame with contact information
         """
         self.contacts_df = contacts_df
+        self._search_blob = None  # Built on first fast_search
         self._init_tool_cache()
 
         # Load company dictionary as DataFrame for lookups
@@ -106,6 +107,22 @@ class SearchTools:
         st.session_state['tool_cache'][cache_key] = result
         st.session_state['tool_cache_timestamps'][cache_key] = datetime.now()
 
+    def _get_search_blob(self) -> pd.Series:
+        """
+        Lowercased name/company/position of each contact joined into one string
+
+        Fields are separated by a unit separator so a keyword can't match across
+        two fields. Built once per tool set, so each search is a single scan.
+        """
+        if self._search_blob is None:
+            df = self.contacts_df
+            fields = [
+                df[col].fillna('').astype(str) if col in df.columns else pd.Series('', index=df.index)
+                for col in ('First Name', 'Last Name', 'Company', 'Position')
+            ]
+            self._search_blob = fields[0].str.cat(fields[1:], sep='\x1f').str.lower()
+        return self._search_blob
+
     def fast_search(self, keywords: str, max_results: int = 20) -> List[Dict]:
         """
         Fast keyword search across name, company, position
@@ -122,17 +139,12 @@ class SearchTools:
             return []
 
         keywords_lower = keywords.lower()
-        df = self.contacts_df.copy()
+        df = self.contacts_df
 
-        # Simple substring search across all fields
-        mask = (
-            df['First Name'].fillna('').str.lower().str.contains(keywords_lower, regex=False, na=False) |
-            df['Last Name'].fillna('').str.lower().str.contains(keywords_lower, regex=False, na=False) |
-            df['Company'].fillna('').str.lower().str.contains(keywords_lower, regex=False, na=False) |
-            df['Position'].fillna('').str.lower().str.contains(keywords_lower, regex=False, na=False)
-        )
+        # Simple substring search across all fields (one pass over the combined column)
+        mask = self._get_search_blob().str.contains(keywords_lower, regex=False, na=False)
 
-        results = df[mask].head(max_results)
+        results = df[mask.to_numpy()].head(max_results)
 
         # Convert to list of dicts
         return [